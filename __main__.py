@@ -1,5 +1,12 @@
-from src import TemplateBot
+from src import ShardedTemplateBot, TemplateBot
+from src.core.cluster import ClusterLauncher
+from src.core.env import TEMPLATEENV
 
 if __name__ == "__main__":
-    bot = TemplateBot()
-    bot.run()
+    if TEMPLATEENV.CLUSTERS > 1:
+        ClusterLauncher(clusters=TEMPLATEENV.CLUSTERS, shard_count=TEMPLATEENV.SHARD_COUNT).run()
+    elif TEMPLATEENV.SHARD_COUNT or TEMPLATEENV.SHARD_IDS:
+        ShardedTemplateBot().run()
+    else:
+        bot = TemplateBot()
+        bot.run()
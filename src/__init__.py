@@ -1,3 +1,6 @@
-from .core import TemplateBot
+from .core import ShardedTemplateBot, TemplateBot
 
-__all__: tuple[str, ...] = ("TemplateBot",)
+__all__: tuple[str, ...] = (
+    "TemplateBot",
+    "ShardedTemplateBot",
+)
@@ -1,3 +1,6 @@
-from .bot import TemplateBot
+from .bot import ShardedTemplateBot, TemplateBot
 
-__all__: tuple[str, ...] = ("TemplateBot",)
+__all__: tuple[str, ...] = (
+    "TemplateBot",
+    "ShardedTemplateBot",
+)
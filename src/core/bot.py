@@ -1,22 +1,30 @@
+import asyncio
+import contextlib
 import datetime
 import importlib
-import inspect
-import pathlib
+import time
 import traceback
 import typing as t
+import weakref
 
 import aiohttp
 import disnake
 from disnake.ext import commands
 
 from src.database import Database
-from src.utils.constants import CHANNELS, EMOJIS, PATHS
+from src.utils.constants import CHANNELS, EMOJIS
 from src.utils.embeds import Embeds
 
 from .env import TEMPLATEENV
 from .logger import Logger
+from .manifest import Extension, load_manifest
+from .responses import CommandLatency, Responder, command_key
+from .sync import incremental_sync_supported, sync_application_commands
 
-__all__: tuple[str, ...] = ("TemplateBot",)
+__all__: tuple[str, ...] = (
+    "TemplateBot",
+    "ShardedTemplateBot",
+)
 
 
 class TemplateBot(commands.InteractionBot):
@@ -25,19 +33,24 @@ class TemplateBot(commands.InteractionBot):
     __version__: str = "0.0.1"
     __author__: str = "FallenDeity"
 
-    def __init__(self) -> None:
-        intents = disnake.Intents(
-            emojis=True,
-            guild_messages=True,
-            guild_scheduled_events=True,
-            guild_typing=True,
-            guilds=True,
-        )
+    def __init__(self, *, name: str = "TemplateBot", **options: t.Any) -> None:
+        self.config = TEMPLATEENV
         self.db = Database(self)
-        self.logger = Logger(name="TemplateBot")
+        self.logger = Logger(name=name)
         self.embeds = Embeds(self)
-        self.config = TEMPLATEENV
-        super().__init__(intents=intents, reload=True)
+        # guild IDs and None for the global scope, whose commands the hashed sync left out of the cache
+        self._unfetched_scopes: set[int | None] = set()
+        self._extensions_ready = asyncio.Event()
+        self.command_latency = CommandLatency(self.config.DEFER_AFTER)
+        # kept alive by the running command and its watchdog, error handlers dispatched later still find it
+        self._responders: weakref.WeakValueDictionary[int, Responder] = weakref.WeakValueDictionary()
+        profile = self.config.CACHE_PROFILE
+        self.logger.info(f"Using the {profile.name} cache profile.")
+        profile_options = profile.options()
+        if self.config.ACTIVITY_CHARACTERS:
+            # privileged, it also has to be enabled in the developer portal
+            profile_options["intents"].message_content = True
+        super().__init__(reload=True, **(profile_options | options))
 
     @staticmethod
     def emoji(name: str) -> str:
@@ -66,22 +79,34 @@ class TemplateBot(commands.InteractionBot):
     async def on_error(self, event_method: str, *_args: t.Any, **_kwargs: t.Any) -> None:
         await self.log_error(f"An error occurred in {event_method}.")
 
-    def _auto_setup(self, path: str) -> None:
-        module = importlib.import_module(path)
-        for name, obj in inspect.getmembers(module):
-            if inspect.isclass(obj) and issubclass(obj, commands.Cog) and name != "BaseCog":
-                self.add_cog(obj(self))
-                self.logger.info(f"Loaded {name} cog.")
+    def _load_extensions(self, extensions: t.Iterable[Extension]) -> None:
+        start = time.perf_counter()
+        timings: dict[str, tuple[float, float]] = {}
+        for extension in extensions:
+            import_start = time.perf_counter()
+            module = importlib.import_module(extension.module)
+            setup_start = time.perf_counter()
+            self.add_cog(getattr(module, extension.name)(self))
+            timings[extension.name] = (setup_start - import_start, time.perf_counter() - setup_start)
+            self.logger.info(f"Loaded {extension.name} cog.")
+        report = ", ".join(
+            f"{name} {imported * 1000:.2f}ms import + {setup * 1000:.2f}ms setup"
+            for name, (imported, setup) in sorted(timings.items(), key=lambda i: -sum(i[1]))
+        )
+        self.logger.flair(f"Loaded {len(timings)} cogs in {(time.perf_counter() - start) * 1000:.2f}ms ({report}).")
 
     def _load_all_extensions(self) -> None:
         self.logger.info("Loading extensions...")
-        extensions = pathlib.Path(PATHS.EXTENSIONS)
-        for path in extensions.glob("*.py"):
-            if path.name.startswith("_"):
-                continue
-            self._auto_setup(f"{extensions.parent}.{extensions.name}.{path.stem}")
+        self._load_extensions(cog for cog in load_manifest().cogs if not cog.deferred)
         self.logger.info("Loaded all extensions!")
 
+    def _load_deferred_extensions(self) -> None:
+        deferred = [cog for cog in load_manifest().cogs if cog.deferred and cog.name not in self.cogs]
+        if deferred:
+            self.logger.info("Loading deferred extensions...")
+            self._load_extensions(deferred)
+            self.disable_dm_commands()
+
     async def close(self) -> None:
         self.logger.info("Closing...")
         await self.http_session.close()
@@ -89,12 +114,97 @@ class TemplateBot(commands.InteractionBot):
         await super().close()
         self.logger.info("Closed!")
 
+    async def wait_until_extensions_ready(self) -> None:
+        """Wait until every extension is loaded, including the deferred ones loaded once the bot is ready."""
+        await self._extensions_ready.wait()
+
+    async def _prepare_application_commands(self) -> None:
+        # the deferred cogs' commands have to be part of the first sync, or it would delete them
+        async with self._sync_queued:
+            await self.wait_until_first_connect()
+            await self.wait_until_extensions_ready()
+            await self._sync_application_commands()
+
+    async def _sync_application_commands(self) -> None:
+        if not incremental_sync_supported(self):
+            self.logger.warning(f"Hashed command sync does not support disnake {disnake.__version__}, syncing fully.")
+            # disnake's full sync diffs against the cached commands, which its own setup fetches first
+            cache = getattr(self, "_cache_application_commands", None)
+            if cache is not None:
+                await cache()
+            await super()._sync_application_commands()
+            return
+        await sync_application_commands(self)
+
+    async def load_commands(self, guild_id: int | None = None) -> None:
+        """Fetch the scope's commands into the cache once, if the hashed sync skipped fetching them."""
+        if guild_id not in self._unfetched_scopes:
+            return
+        self._unfetched_scopes.discard(guild_id)
+        with contextlib.suppress(disnake.HTTPException):
+            if guild_id is None:
+                await self.fetch_global_commands(with_localizations=True)
+            else:
+                await self.fetch_guild_commands(guild_id, with_localizations=True)
+
+    async def process_application_commands(self, interaction: disnake.ApplicationCommandInteraction) -> None:
+        # disnake wipes the guild's commands when one it never fetched is used, fetch them once instead
+        if interaction.data.get("guild_id") and not self.get_guild_command(interaction.guild_id, interaction.data.id):
+            await self.load_commands(interaction.guild_id)
+        await super().process_application_commands(interaction)
+
     async def on_ready(self) -> None:
         self.logger.flair(f"Logged in as {self.user} ({self.user.id})")
+        try:
+            self._load_deferred_extensions()
+        finally:
+            self._extensions_ready.set()
+        await self.db.guildconfig.warm(guild.id for guild in self.guilds)
+
+    def _responder(self, interaction: disnake.ApplicationCommandInteraction) -> Responder:
+        if (responder := self._responders.get(interaction.id)) is None:
+            responder = Responder(interaction, ephemeral=self._ephemeral(interaction))
+        return responder
+
+    def _ephemeral(self, interaction: disnake.ApplicationCommandInteraction) -> bool:
+        """Whether the command declared ``extras={"ephemeral": True}``, it is deferred privately then."""
+        getters = {
+            disnake.ApplicationCommandType.chat_input: self.get_slash_command,
+            disnake.ApplicationCommandType.user: self.get_user_command,
+            disnake.ApplicationCommandType.message: self.get_message_command,
+        }
+        getter = getters.get(interaction.data.type)
+        command = getter(interaction.data.name) if getter is not None else None
+        return command is not None and bool(command.extras.get("ephemeral"))
+
+    async def respond(self, interaction: disnake.ApplicationCommandInteraction, **kwargs: t.Any) -> None:
+        """Answer the command, directly or by editing the response it was deferred with."""
+        await self._responder(interaction).send(**kwargs)
+
+    async def defer(self, interaction: disnake.ApplicationCommandInteraction) -> None:
+        """Defer the command for responses that need the original message, unless it already was answered."""
+        await self._responder(interaction).defer()
+
+    async def on_guild_join(self, guild: disnake.Guild) -> None:
+        await self.db.guildconfig.warm([guild.id])
+
+    async def on_guild_available(self, guild: disnake.Guild) -> None:
+        # at startup on_ready warms every guild with a single query
+        if self.is_ready():
+            await self.db.guildconfig.warm([guild.id])
 
     async def on_application_command(self, interaction: disnake.ApplicationCommandInteraction) -> None:
-        await interaction.response.defer()
-        await self.process_application_commands(interaction)
+        key = command_key(interaction)
+        responder = self._responders[interaction.id] = Responder(interaction, ephemeral=self._ephemeral(interaction))
+        if self.command_latency.likely_slow(key):
+            await responder.defer()
+        else:
+            # fast commands answer directly, the watchdog still defers one that turns out slow this time
+            responder.watch(self.command_latency.threshold)
+        try:
+            await self.process_application_commands(interaction)
+        finally:
+            self.command_latency.record(key, responder.elapsed)
 
     def run(self, *args: t.Any, **kwargs: t.Any) -> None:
         self.http_session = aiohttp.ClientSession()
@@ -104,8 +214,7 @@ class TemplateBot(commands.InteractionBot):
         self.logger.info("Starting...")
         try:
             super().run(str(self.config.TOKEN), *args, **kwargs)
-        except (KeyboardInterrupt, KeyError):
-            self.logger.critical("Failed to run the bot!")
+        except KeyboardInterrupt:
             self.logger.info("Closed!")
 
     @property
@@ -116,3 +225,27 @@ class TemplateBot(commands.InteractionBot):
     @property
     def uptime(self) -> float:
         return (datetime.datetime.utcnow() - self._uptime).total_seconds()  # type: ignore
+
+
+class ShardedTemplateBot(TemplateBot, commands.AutoShardedInteractionBot):
+    """:class:`TemplateBot` running several gateway shards in one process.
+
+    The shards default to ``SHARD_COUNT`` and ``SHARD_IDS``, when both are unset Discord's recommended
+    count is used and every shard runs here. The cluster launcher starts one per process with its own range.
+    """
+
+    def __init__(
+        self,
+        *,
+        shard_ids: t.Sequence[int] | None = None,
+        shard_count: int | None = None,
+        cluster_id: int | None = None,
+        **options: t.Any,
+    ) -> None:
+        self.cluster_id = cluster_id
+        super().__init__(
+            name="TemplateBot" if cluster_id is None else f"TemplateBot[{cluster_id}]",
+            shard_ids=list(shard_ids if shard_ids is not None else TEMPLATEENV.SHARD_IDS) or None,
+            shard_count=shard_count or TEMPLATEENV.SHARD_COUNT or None,
+            **options,
+        )
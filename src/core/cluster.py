@@ -0,0 +1,190 @@
+import asyncio
+import collections
+import math
+import multiprocessing
+import multiprocessing.process
+import multiprocessing.synchronize
+import signal
+import time
+import typing as t
+
+import aiohttp
+import attrs
+from disnake.ext import commands
+
+from .bot import ShardedTemplateBot
+from .env import TEMPLATEENV
+from .logger import Logger
+
+__all__: tuple[str, ...] = (
+    "Cluster",
+    "ClusterLauncher",
+)
+
+
+GATEWAY_BOT = "https://discord.com/api/v10/gateway/bot"
+# Discord lets max_concurrency shards identify per window of this many seconds
+IDENTIFY_INTERVAL = 5.0
+# allowance for a worker's database setup before its shards start identifying
+STARTUP_TIMEOUT = 60.0
+# seconds a worker has to stay up before its restart backoff starts over
+STABLE_AFTER = 60.0
+MAX_BACKOFF = 60.0
+# seconds between the launcher's checks of the starting and the running workers
+POLL_INTERVAL = 0.5
+
+
+def _run_worker(
+    cluster_id: int, shard_ids: tuple[int, ...], shard_count: int, ready: multiprocessing.synchronize.Event
+) -> None:
+    # only the first cluster syncs application commands, the others would repeat the same requests
+    options = {} if cluster_id == 0 else {"command_sync_flags": commands.CommandSyncFlags.none()}
+    bot = ShardedTemplateBot(shard_ids=shard_ids, shard_count=shard_count, cluster_id=cluster_id, **options)
+
+    async def launched() -> None:
+        ready.set()
+
+    bot.add_listener(launched, "on_ready")
+    bot.run()
+
+
+@attrs.define(slots=True)
+class Cluster:
+    """One worker process and the contiguous range of shards it runs."""
+
+    id: int
+    shard_ids: tuple[int, ...]
+    process: multiprocessing.process.BaseProcess | None = None
+    started_at: float = 0.0
+    restart_at: float | None = None
+    restarts: int = 0
+    failures: int = 0
+    stopped: bool = False
+
+
+class ClusterLauncher:
+    """Splits the bot's shards across ``clusters`` worker processes and restarts the ones that crash.
+
+    Workers start one after another, the next only once the previous one's shards are all ready or had
+    the time to identify, so all processes together stay within Discord's identify rate limit. A worker
+    exiting with a non-zero code is restarted with an exponential backoff, a clean exit stops it. Restarts
+    queue up behind the workers still starting, while every running one keeps being supervised.
+    """
+
+    def __init__(self, *, clusters: int, shard_count: int = 0) -> None:
+        self.logger = Logger(name="ClusterLauncher")
+        self.cluster_count = clusters
+        self.shard_count = shard_count
+        self.max_concurrency = 1
+        self.clusters: list[Cluster] = []
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = False
+        # clusters waiting for their turn to start, and the one starting with its ready event and deadline
+        self._pending: collections.deque[Cluster] = collections.deque()
+        self._starting: tuple[Cluster, multiprocessing.synchronize.Event, float] | None = None
+
+    async def _gateway(self) -> tuple[int, int]:
+        """The recommended shard count and the identify concurrency of the bot."""
+        headers = {"Authorization": f"Bot {TEMPLATEENV.TOKEN}"}
+        async with aiohttp.ClientSession() as session, session.get(GATEWAY_BOT, headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+        return data["shards"], data["session_start_limit"]["max_concurrency"]
+
+    @staticmethod
+    def split(shard_count: int, clusters: int) -> list[tuple[int, ...]]:
+        """Contiguous shard ranges of (nearly) equal size, one per cluster."""
+        size = math.ceil(shard_count / clusters)
+        return [tuple(range(start, min(start + size, shard_count))) for start in range(0, shard_count, size)]
+
+    def _start(self, cluster: Cluster) -> None:
+        ready = self._context.Event()
+        cluster.process = self._context.Process(
+            target=_run_worker,
+            args=(cluster.id, cluster.shard_ids, self.shard_count, ready),
+            name=f"cluster-{cluster.id}",
+        )
+        cluster.process.start()
+        cluster.started_at = time.monotonic()
+        cluster.restart_at = None
+        self.logger.info(
+            f"Started cluster {cluster.id} (pid {cluster.process.pid}) "
+            f"with shards {cluster.shard_ids[0]}-{cluster.shard_ids[-1]}."
+        )
+        # the next cluster may identify once this one is ready, or should have been
+        identify = math.ceil(len(cluster.shard_ids) / self.max_concurrency) * IDENTIFY_INTERVAL
+        self._starting = (cluster, ready, cluster.started_at + STARTUP_TIMEOUT + identify)
+
+    def _advance(self) -> None:
+        """Start the next queued cluster once the starting one is ready, died or had the time to identify."""
+        if self._starting is not None:
+            cluster, ready, deadline = self._starting
+            assert cluster.process is not None
+            if ready.is_set():
+                self.logger.info(f"Cluster {cluster.id} is ready.")
+            elif cluster.process.is_alive() and time.monotonic() < deadline:
+                return
+            elif cluster.process.is_alive():
+                self.logger.warning(f"Cluster {cluster.id} is not ready yet, starting the next one anyway.")
+            self._starting = None
+        if self._pending:
+            self._start(self._pending.popleft())
+
+    def _supervise(self) -> None:
+        for cluster in self.clusters:
+            process = cluster.process
+            if cluster.stopped or process is None or process.is_alive():
+                continue
+            now = time.monotonic()
+            if cluster.restart_at is None:
+                if process.exitcode == 0:
+                    self.logger.info(f"Cluster {cluster.id} exited.")
+                    cluster.stopped = True
+                    continue
+                cluster.failures = 1 if now - cluster.started_at >= STABLE_AFTER else cluster.failures + 1
+                backoff = min(2.0 ** (cluster.failures - 1), MAX_BACKOFF)
+                cluster.restart_at = now + backoff
+                self.logger.error(
+                    f"Cluster {cluster.id} died with exit code {process.exitcode}, restarting in {backoff:.0f}s."
+                )
+            elif now >= cluster.restart_at and cluster not in self._pending:
+                cluster.restarts += 1
+                self._pending.append(cluster)
+
+    def _stop(self, *_: t.Any) -> None:
+        self._stopping = True
+
+    def _shutdown(self) -> None:
+        self.logger.info("Stopping the clusters...")
+        processes = [c.process for c in self.clusters if c.process is not None and c.process.is_alive()]
+        # SIGTERM lets every bot close its gateway and database connections
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(30)
+            if process.is_alive():
+                process.kill()
+        self.logger.info("Stopped all clusters.")
+
+    def run(self) -> None:
+        recommended, self.max_concurrency = asyncio.run(self._gateway())
+        self.shard_count = self.shard_count or recommended
+        clusters = min(self.cluster_count, self.shard_count)
+        self.clusters = [Cluster(i, shards) for i, shards in enumerate(self.split(self.shard_count, clusters))]
+        self.logger.flair(
+            f"Launching {self.shard_count} shards across {len(self.clusters)} clusters "
+            f"(identify concurrency {self.max_concurrency})."
+        )
+        previous: dict[int, t.Any] = {}
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous[signum] = signal.signal(signum, self._stop)
+        self._pending.extend(self.clusters)
+        try:
+            while not self._stopping and not all(cluster.stopped for cluster in self.clusters):
+                self._supervise()
+                self._advance()
+                time.sleep(POLL_INTERVAL)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            self._shutdown()
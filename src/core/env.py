@@ -5,10 +5,13 @@ from dataclasses import dataclass
 from dotenv import load_dotenv
 
 from .errors import ConversionError, MissingEnvironmentVariable
+from .profiles import cache_profile
 
 __all__: tuple[str, ...] = (
     "TEMPLATEENV",
     "MISSING",
+    "boolean",
+    "integers",
 )
 
 
@@ -18,6 +21,21 @@ load_dotenv()
 # we need to do due to generic typing of load_dotenv
 
 
+def boolean(value: t.Any) -> bool:
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def integers(value: t.Any) -> tuple[int, ...]:
+    """Comma separated integers and inclusive ranges, e.g. ``0-3,8``."""
+    result: list[int] = []
+    for part in str(value).split(","):
+        if not (part := part.strip()):
+            continue
+        start, _, end = part.partition("-")
+        result.extend(range(int(start), int(end or start) + 1))
+    return tuple(result)
+
+
 @dataclass(kw_only=True)
 class Variable:
     name: str
@@ -26,7 +44,10 @@ class Variable:
     required: bool = False
 
     def __post_init__(self) -> None:
-        self.default = os.getenv(self.name, self.default)
+        value = os.getenv(self.name)
+        # keys left empty, as in .env.sample, fall back to the default when there is one
+        if value is not None and (value or self.default is MISSING):
+            self.default = value
         if self.default is MISSING and self.required:
             raise MissingEnvironmentVariable(self.name)
         try:
@@ -49,11 +70,44 @@ class Variable:
 
 class Environment:
     TOKEN = Variable(name="TOKEN")
+    SHARD_COUNT = Variable(name="SHARD_COUNT", default=0, cast=int)
+    SHARD_IDS = Variable(name="SHARD_IDS", default="", cast=integers)
+    CLUSTERS = Variable(name="CLUSTERS", default=1, cast=int)
+    CACHE_PROFILE = Variable(name="CACHE_PROFILE", default="standard", cast=cache_profile)
+    DEFER_AFTER = Variable(name="DEFER_AFTER", default=1.5, cast=float)
     PGUSER = Variable(name="PGUSER")
     PGPASSWORD = Variable(name="PGPASSWORD")
     PGDATABASE = Variable(name="PGDATABASE")
     PGHOST = Variable(name="PGHOST")
-    PGPORT = Variable(name="PGPORT", cast=int)
+    PGPORT = Variable(name="PGPORT", default=5432, cast=int)
+    PGBACKEND = Variable(name="PGBACKEND", default="postgres")
+    PGBACKEND_LATENCY_MS = Variable(name="PGBACKEND_LATENCY_MS", default=0.0, cast=float)
+    PGREPLICA_HOST = Variable(name="PGREPLICA_HOST", default="")
+    PGREPLICA_PORT = Variable(name="PGREPLICA_PORT", default=0, cast=int)
+    PGREPLICA_MAX_LAG = Variable(name="PGREPLICA_MAX_LAG", default=5.0, cast=float)
+    PGREPLICA_LAG_INTERVAL = Variable(name="PGREPLICA_LAG_INTERVAL", default=10.0, cast=float)
+    PGPOOL_MIN_SIZE = Variable(name="PGPOOL_MIN_SIZE", default=10, cast=int)
+    PGPOOL_MAX_SIZE = Variable(name="PGPOOL_MAX_SIZE", default=10, cast=int)
+    PGPOOL_MAX_QUERIES = Variable(name="PGPOOL_MAX_QUERIES", default=50000, cast=int)
+    PGPOOL_MAX_INACTIVE_LIFETIME = Variable(name="PGPOOL_MAX_INACTIVE_LIFETIME", default=300.0, cast=float)
+    PGCOMMAND_TIMEOUT = Variable(name="PGCOMMAND_TIMEOUT", default=0.0, cast=float)
+    PGMIGRATIONS_DRY_RUN = Variable(name="PGMIGRATIONS_DRY_RUN", default=False, cast=boolean)
+    PGMIGRATIONS_BASELINE = Variable(name="PGMIGRATIONS_BASELINE", default=True, cast=boolean)
+    PGQUERY_TIMEOUT = Variable(name="PGQUERY_TIMEOUT", default=2.5, cast=float)
+    PGBREAKER_FAILURE_RATE = Variable(name="PGBREAKER_FAILURE_RATE", default=0.5, cast=float)
+    PGBREAKER_MIN_CALLS = Variable(name="PGBREAKER_MIN_CALLS", default=20, cast=int)
+    PGBREAKER_WINDOW = Variable(name="PGBREAKER_WINDOW", default=10.0, cast=float)
+    PGBREAKER_OPEN_FOR = Variable(name="PGBREAKER_OPEN_FOR", default=5.0, cast=float)
+    PGBREAKER_TRIALS = Variable(name="PGBREAKER_TRIALS", default=3, cast=int)
+    PGSLOW_QUERY_MS = Variable(name="PGSLOW_QUERY_MS", default=200, cast=int)
+    PGSLOW_QUERY_EXPLAIN = Variable(name="PGSLOW_QUERY_EXPLAIN", default=False, cast=boolean)
+    PGWRITE_INTERVAL = Variable(name="PGWRITE_INTERVAL", default=250, cast=int)
+    PGWRITE_BATCH_SIZE = Variable(name="PGWRITE_BATCH_SIZE", default=500, cast=int)
+    PGWRITE_MAX_PENDING = Variable(name="PGWRITE_MAX_PENDING", default=10000, cast=int)
+    ACTIVITY_FLUSH_INTERVAL = Variable(name="ACTIVITY_FLUSH_INTERVAL", default=10.0, cast=float)
+    ACTIVITY_MAX_BUCKETS = Variable(name="ACTIVITY_MAX_BUCKETS", default=50000, cast=int)
+    ACTIVITY_CHARACTERS = Variable(name="ACTIVITY_CHARACTERS", default=False, cast=boolean)
+    TIMER_WINDOW = Variable(name="TIMER_WINDOW", default=1000, cast=int)
 
 
 TEMPLATEENV = Environment()
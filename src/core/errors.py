@@ -22,6 +22,8 @@ __all__: tuple[str, ...] = (
     "DurationError",
     "ModalException",
     "ViewTimeout",
+    "MigrationError",
+    "DatabaseUnavailable",
 )
 
 
@@ -103,6 +105,25 @@ class ConversionError(TemplateException):
         return f"Failed to convert {self.name} to {self.value}: {self.error}"
 
 
+class MigrationError(TemplateException):
+    """Exception raised when the database migrations cannot be applied safely."""
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(f"Migration error: {message}")
+
+    def __str__(self) -> str:
+        return f"Migration error: {self.message}"
+
+
+class DatabaseUnavailable(TemplateException):
+    """Exception raised when the database is down or too slow and calls fail fast."""
+
+    def __init__(self, retry_after: float = 0.0) -> None:
+        self.retry_after = retry_after
+        super().__init__(f"Database unavailable, retry in {retry_after:.1f}s")
+
+
 class DateConversionError(ConversionError):
     """Exception raised when a date conversion fails."""
 
@@ -245,6 +266,13 @@ class BotExceptions(enum.Enum):
             "I don't know what happened but I have notified my developers about this.",
         ],
     )
+    DATABASE_UNAVAILABLE = ExceptionResponse(
+        error=DatabaseUnavailable,
+        messages=[
+            "I can't reach my database right now, try again in a few seconds.",
+            "My memory is a bit foggy at the moment, give me a few seconds and try again.",
+        ],
+    )
     DateConversionError = ExceptionResponse(
         error=DateConversionError,
         messages=[],
@@ -0,0 +1,132 @@
+import ast
+import functools
+import json
+import pathlib
+import typing as t
+
+import attrs
+
+from src.utils.constants import PATHS
+
+__all__: tuple[str, ...] = (
+    "Extension",
+    "Manifest",
+    "load_manifest",
+)
+
+
+VERSION = 1
+COG_BASES = frozenset({"BaseCog", "Cog"})
+TABLE_BASES = frozenset({"Table"})
+
+
+@attrs.define(frozen=True, slots=True)
+class Extension:
+    """A cog or table class found in a module's source, without importing it."""
+
+    module: str
+    name: str
+    deferred: bool = False
+
+
+def _base_names(node: ast.ClassDef) -> set[str]:
+    names: set[str] = set()
+    for base in node.bases:
+        if isinstance(base, ast.Subscript):
+            base = base.value
+        if isinstance(base, ast.Attribute):
+            names.add(base.attr)
+        elif isinstance(base, ast.Name):
+            names.add(base.id)
+    return names
+
+
+def _flag(node: ast.ClassDef, name: str) -> bool:
+    return any(
+        keyword.arg == name and isinstance(keyword.value, ast.Constant) and bool(keyword.value.value)
+        for keyword in node.keywords
+    )
+
+
+def _modules(directory: str) -> list[pathlib.Path]:
+    return sorted(path for path in pathlib.Path(directory).glob("*.py") if not path.name.startswith("_"))
+
+
+def scan(directory: str, bases: t.AbstractSet[str]) -> list[Extension]:
+    """The top level classes of the directory's modules that directly subclass one of ``bases``."""
+    found: list[Extension] = []
+    for path in _modules(directory):
+        module = ".".join(path.with_suffix("").parts)
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=path.as_posix())
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and _base_names(node) & bases:
+                found.append(Extension(module, node.name, _flag(node, "deferred")))
+    return found
+
+
+@attrs.define(frozen=True, slots=True, kw_only=True)
+class Manifest:
+    """The cogs and tables to load, generated from the sources so startup skips module introspection.
+
+    The manifest is kept in ``PATHS.MANIFEST`` and rebuilt whenever a module was added, removed or
+    modified since, which only takes a stat per file to tell. ``python -m src.core.manifest``
+    rebuilds it by hand.
+    """
+
+    cogs: tuple[Extension, ...]
+    tables: tuple[Extension, ...]
+    # source file -> modification time in nanoseconds when the manifest was built
+    sources: dict[str, int]
+
+    @staticmethod
+    def _sources() -> dict[str, int]:
+        return {
+            path.as_posix(): path.stat().st_mtime_ns
+            for directory in (PATHS.EXTENSIONS, PATHS.TABLES)
+            for path in _modules(directory)
+        }
+
+    @classmethod
+    def build(cls, sources: dict[str, int] | None = None) -> "Manifest":
+        return cls(
+            cogs=tuple(scan(PATHS.EXTENSIONS, COG_BASES)),
+            tables=tuple(scan(PATHS.TABLES, TABLE_BASES)),
+            sources=sources if sources is not None else cls._sources(),
+        )
+
+    def save(self, path: str = PATHS.MANIFEST) -> None:
+        file = pathlib.Path(path)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(json.dumps({"version": VERSION, **attrs.asdict(self)}, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str = PATHS.MANIFEST) -> "Manifest":
+        """The saved manifest, rebuilt and saved again when it is missing or out of date."""
+        sources = cls._sources()
+        try:
+            data = json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+            if data["version"] == VERSION and data["sources"] == sources:
+                return cls(
+                    cogs=tuple(Extension(**cog) for cog in data["cogs"]),
+                    tables=tuple(Extension(**table) for table in data["tables"]),
+                    sources=sources,
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        manifest = cls.build(sources)
+        try:
+            manifest.save(path)
+        except OSError:
+            # a read-only deployment still starts, it just scans the sources every time
+            pass
+        return manifest
+
+
+@functools.lru_cache(maxsize=None)
+def load_manifest() -> Manifest:
+    """The manifest shared by the bot's cogs and the database's tables."""
+    return Manifest.load()
+
+
+if __name__ == "__main__":
+    Manifest.build().save()
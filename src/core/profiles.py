@@ -0,0 +1,71 @@
+import typing as t
+
+import attrs
+import disnake
+
+__all__: tuple[str, ...] = (
+    "CacheProfile",
+    "CACHE_PROFILES",
+    "cache_profile",
+)
+
+
+@attrs.define(frozen=True, slots=True, kw_only=True)
+class CacheProfile:
+    """Gateway intents and cache sizes of the bot, traded off against the memory they cost."""
+
+    name: str
+    intents: t.Callable[[], disnake.Intents]
+    member_cache_flags: t.Callable[[disnake.Intents], disnake.MemberCacheFlags]
+    max_messages: int | None
+    chunk_guilds_at_startup: bool
+
+    def options(self) -> dict[str, t.Any]:
+        """Keyword arguments for the bot's constructor."""
+        intents = self.intents()
+        return dict(
+            intents=intents,
+            member_cache_flags=self.member_cache_flags(intents),
+            max_messages=self.max_messages,
+            chunk_guilds_at_startup=self.chunk_guilds_at_startup,
+        )
+
+
+CACHE_PROFILES: dict[str, CacheProfile] = {
+    # guilds and message events only, nothing beyond the guilds themselves is cached
+    "minimal": CacheProfile(
+        name="minimal",
+        intents=lambda: disnake.Intents(guilds=True, guild_messages=True),
+        member_cache_flags=lambda _: disnake.MemberCacheFlags.none(),
+        max_messages=None,
+        chunk_guilds_at_startup=False,
+    ),
+    "standard": CacheProfile(
+        name="standard",
+        intents=lambda: disnake.Intents(
+            emojis=True,
+            guild_messages=True,
+            guild_scheduled_events=True,
+            guild_typing=True,
+            guilds=True,
+        ),
+        member_cache_flags=disnake.MemberCacheFlags.from_intents,
+        max_messages=1000,
+        chunk_guilds_at_startup=False,
+    ),
+    # every intent, the privileged ones have to be enabled in the developer portal
+    "full": CacheProfile(
+        name="full",
+        intents=disnake.Intents.all,
+        member_cache_flags=disnake.MemberCacheFlags.from_intents,
+        max_messages=5000,
+        chunk_guilds_at_startup=True,
+    ),
+}
+
+
+def cache_profile(name: str) -> CacheProfile:
+    try:
+        return CACHE_PROFILES[name.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown cache profile {name!r}, expected one of {', '.join(CACHE_PROFILES)}.") from None
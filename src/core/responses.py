@@ -0,0 +1,102 @@
+import asyncio
+import time
+import typing as t
+
+import disnake
+
+__all__: tuple[str, ...] = (
+    "CommandLatency",
+    "Responder",
+    "command_key",
+)
+
+
+# weight of the newest sample in a command's moving average
+ALPHA = 0.2
+SUBCOMMANDS = (disnake.OptionType.sub_command, disnake.OptionType.sub_command_group)
+
+
+def command_key(interaction: disnake.ApplicationCommandInteraction) -> str:
+    """The invoked command's full name, including its subcommand group and subcommand."""
+    parts = [interaction.data.name]
+    options = interaction.data.options
+    while options and options[0].type in SUBCOMMANDS:
+        parts.append(options[0].name)
+        options = options[0].options
+    return " ".join(parts)
+
+
+class CommandLatency:
+    """Exponentially weighted moving average of every command's time to its first response."""
+
+    def __init__(self, threshold: float) -> None:
+        self.threshold = threshold
+        self._averages: dict[str, float] = {}
+
+    def likely_slow(self, key: str) -> bool:
+        average = self._averages.get(key)
+        return average is not None and average > self.threshold
+
+    def record(self, key: str, seconds: float) -> None:
+        average = self._averages.get(key)
+        self._averages[key] = seconds if average is None else average + ALPHA * (seconds - average)
+
+
+class Responder:
+    """The single response path of an application command interaction, deferred or not.
+
+    :meth:`send` answers the interaction directly while it is unacknowledged and edits the original
+    response after it was deferred or answered. A lock orders it against the watchdog's :meth:`defer`,
+    so the interaction is never acknowledged twice. ``ephemeral`` commands are deferred privately, an
+    ephemeral answer to a public deferral is sent as a private followup replacing the public placeholder.
+    """
+
+    def __init__(self, interaction: disnake.ApplicationCommandInteraction, *, ephemeral: bool = False) -> None:
+        self.interaction = interaction
+        self.ephemeral = ephemeral
+        self.started_at = time.perf_counter()
+        self.responded_at: float | None = None
+        self.deferred = False
+        self._lock = asyncio.Lock()
+        self._watchdog: asyncio.Task[None] | None = None
+        # the private followup standing in for a deleted public placeholder, later sends edit it
+        self._followup: disnake.WebhookMessage | None = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds until the first response, or so far without one."""
+        return (self.responded_at or time.perf_counter()) - self.started_at
+
+    async def defer(self) -> None:
+        async with self._lock:
+            if not self.interaction.response.is_done():
+                await self.interaction.response.defer(ephemeral=self.ephemeral)
+                self.deferred = True
+
+    def watch(self, delay: float) -> None:
+        """Defer the interaction unless it is answered within ``delay`` seconds."""
+        self._watchdog = asyncio.create_task(self._watch(delay))
+
+    async def _watch(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        if self.responded_at is None:
+            # shielded, a cancelled defer could acknowledge the interaction without the response knowing
+            await asyncio.shield(self.defer())
+
+    async def send(self, **kwargs: t.Any) -> None:
+        async with self._lock:
+            first = self.responded_at is None
+            if first:
+                self.responded_at = time.perf_counter()
+            if not self.interaction.response.is_done():
+                await self.interaction.response.send_message(**kwargs)
+                return
+            ephemeral = kwargs.pop("ephemeral", False)
+            if self._followup is not None:
+                await self._followup.edit(**kwargs)
+            elif first and self.deferred and ephemeral and not self.ephemeral:
+                # a public deferral cannot be made private, answer privately and drop the placeholder
+                self._followup = await self.interaction.followup.send(ephemeral=True, wait=True, **kwargs)
+                await self.interaction.delete_original_response()
+            else:
+                await self.interaction.edit_original_response(**kwargs)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import typing as t
+
+import disnake
+from disnake.ext import commands
+
+from src.utils.constants import BOT_ID
+
+try:
+    from disnake.ext.commands.interaction_bot_base import _app_commands_diff, _get_to_send_from_diff
+except ImportError:  # pragma: no cover - depends on the installed disnake
+    _app_commands_diff = _get_to_send_from_diff = None
+
+if t.TYPE_CHECKING:
+    from .bot import TemplateBot
+
+
+__all__: tuple[str, ...] = (
+    "command_hash",
+    "command_scopes",
+    "incremental_sync_supported",
+    "sync_application_commands",
+)
+
+
+GLOBAL = "global"
+# scopes with at most this many added or edited commands upsert them one by one, without fetching the scope,
+# every upsert counts toward Discord's daily limit of 200 application command creates per scope
+MAX_UPSERTS = 5
+# disnake internals the sync relies on, any missing one falls back to disnake's own full sync
+BOT_INTERNALS = ("_command_sync_flags", "_ordered_unsynced_commands", "_test_guilds", "_cache_application_commands")
+FLAG_INTERNALS = ("_sync_enabled", "allow_command_deletion", "sync_global_commands", "sync_guild_commands")
+
+
+def incremental_sync_supported(bot: commands.InteractionBot) -> bool:
+    """Whether the installed disnake still has every internal the hashed sync relies on."""
+    if _app_commands_diff is None or _get_to_send_from_diff is None:
+        return False
+    if not all(hasattr(bot, name) for name in BOT_INTERNALS):
+        return False
+    return all(hasattr(bot._command_sync_flags, name) for name in FLAG_INTERNALS)
+
+
+def command_hash(command: disnake.ApplicationCommand) -> str:
+    """A digest of the command's normalized payload, as sent to Discord."""
+    # commands with auto_sync disabled are never edited, only their existence counts
+    payload = {} if getattr(command, "_always_synced", False) else command.to_dict()
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(data.encode(), digest_size=12).hexdigest()
+
+
+def _key(command: disnake.ApplicationCommand) -> str:
+    return f"{command.type.value}:{command.name}"
+
+
+def command_scopes(bot: commands.InteractionBot) -> dict[str, list[disnake.ApplicationCommand]]:
+    """The commands to sync per scope, ``global`` and the guild IDs, limited by the sync flags."""
+    flags = bot._command_sync_flags
+    global_commands, guild_commands = bot._ordered_unsynced_commands(bot._test_guilds)
+    scopes: dict[str, list[disnake.ApplicationCommand]] = {}
+    if flags.sync_global_commands:
+        scopes[GLOBAL] = global_commands
+    if flags.sync_guild_commands:
+        scopes.update((str(guild_id), bodies) for guild_id, bodies in guild_commands.items())
+    return scopes
+
+
+async def _overwrite(bot: "TemplateBot", guild_id: int | None, bodies: list[disnake.ApplicationCommand]) -> None:
+    """Fetch the scope's commands and bulk overwrite them with the local ones, as disnake's full sync does."""
+    if guild_id is None:
+        current = await bot.fetch_global_commands(with_localizations=True)
+    else:
+        current = await bot.fetch_guild_commands(guild_id, with_localizations=True)
+    assert _app_commands_diff is not None and _get_to_send_from_diff is not None
+    diff = _app_commands_diff(bodies, current)
+    if not bot._command_sync_flags.allow_command_deletion:
+        diff["delete_ignored"], diff["delete"] = diff["delete"], []
+    if not (diff["upsert"] or diff["edit"] or diff["delete"]):
+        return
+    to_send = _get_to_send_from_diff(diff)
+    if guild_id is None:
+        await bot.bulk_overwrite_global_commands(to_send)
+    else:
+        await bot.bulk_overwrite_guild_commands(guild_id, to_send)
+
+
+async def _upsert(bot: "TemplateBot", guild_id: int | None, changed: list[disnake.ApplicationCommand]) -> None:
+    # creating a command under an existing name and type overwrites it in place
+    for command in changed:
+        if guild_id is None:
+            await bot.create_global_command(command)
+        else:
+            await bot.create_guild_command(guild_id, command)
+
+
+async def sync_application_commands(bot: "TemplateBot") -> None:
+    """Sync only the application commands whose payload changed since the last sync.
+
+    The payload hashes of every command are kept per scope in the ``config`` table. A scope whose
+    hashes all match is skipped without a single request, a few added or edited commands are upserted
+    on their own, and only removals, many changes or an unknown remote state fall back to fetching
+    the scope and overwriting it in bulk.
+    """
+    if not bot._command_sync_flags._sync_enabled or bot.is_closed():
+        return
+    application = str(bot.application_id)
+    try:
+        # the last known hashes still tell which commands changed while the database is unavailable
+        config, _ = await bot.db.config.get_or_stale(BOT_ID)
+        document = config.commands if config is not None else {}
+    except Exception as e:
+        bot.logger.error(f"Failed to load the command hashes, syncing every scope: {e}")
+        document = {}
+    # hashes stored for another application say nothing about this one's commands
+    stored: dict[str, dict[str, str]] = document.get("scopes", {}) if document.get("application") == application else {}
+    synced: dict[str, dict[str, str]] = {}
+    for scope, bodies in command_scopes(bot).items():
+        hashes = {_key(body): command_hash(body) for body in bodies}
+        previous = stored.get(scope)
+        guild_id = None if scope == GLOBAL else int(scope)
+        if previous == hashes:
+            synced[scope] = hashes
+            bot._unfetched_scopes.add(guild_id)
+            continue
+        changed = [body for body in bodies if previous is None or previous.get(_key(body)) != hashes[_key(body)]]
+        removed = previous.keys() - hashes.keys() if previous is not None else set()
+        # without the previous hashes, or with commands to delete, the scope's remote state is needed
+        full = previous is None or bool(removed)
+        try:
+            if full or len(changed) > MAX_UPSERTS:
+                await _overwrite(bot, guild_id, bodies)
+                bot._unfetched_scopes.discard(guild_id)
+            else:
+                # only the upserted commands are cached now
+                await _upsert(bot, guild_id, changed)
+                bot._unfetched_scopes.add(guild_id)
+        except disnake.HTTPException as e:
+            bot.logger.error(f"Failed to sync the application commands of the {scope} scope: {e}")
+            bot._unfetched_scopes.add(guild_id)
+            if previous is not None:
+                synced[scope] = previous
+            continue
+        synced[scope] = hashes
+        bot.logger.info(
+            f"Synced the application commands of the {scope} scope ({len(changed)} changed, {len(removed)} removed)."
+        )
+    if synced == stored and document.get("application") == application:
+        bot.logger.info("Application commands are unchanged, skipped the sync.")
+        return
+    await bot.db.config.update_commands(BOT_ID, {"application": application, "scopes": synced})
@@ -6,6 +6,7 @@ import disnake
 from .. import BaseView
 
 if t.TYPE_CHECKING:
+    from src import TemplateBot
     from src.utils.embeds import BaseEmbed
 
 
@@ -100,6 +101,6 @@ class ClassicPaginator(BaseView):
         assert isinstance(inter.author, disnake.Member)
         assert isinstance(items, list)
         paginator = cls(inter.author, timeout=timeout, items=items)
+        await t.cast("TemplateBot", inter.client).respond(inter, embed=paginator._items[paginator.page], view=paginator)
         paginator.message = await inter.original_response()
-        await paginator._update_message(inter)
         return paginator
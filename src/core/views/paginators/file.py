@@ -5,6 +5,7 @@ import disnake
 from .classic import ClassicPaginator
 
 if t.TYPE_CHECKING:
+    from src import TemplateBot
     from src.utils.embeds import BaseEmbed
 
 
@@ -48,6 +49,8 @@ class FilePaginator(ClassicPaginator):
     ) -> "FilePaginator":
         assert isinstance(inter.author, disnake.Member)
         paginator = cls(inter.author, timeout=timeout, items=items)
+        # the first page is uploaded by editing the original response, which needs one to exist
+        await t.cast("TemplateBot", inter.client).defer(inter)
         paginator.message = await inter.original_response()
         await paginator._update_message(inter)
         return paginator
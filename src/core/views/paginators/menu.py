@@ -58,8 +58,8 @@ class MenuPaginator(ClassicPaginator):
         assert isinstance(inter.author, disnake.Member)
         assert isinstance(items, dict)
         paginator = cls(inter.author, timeout=timeout, items=items, bot=bot)
+        await t.cast("TemplateBot", inter.client).respond(inter, embed=paginator._items[paginator.page], view=paginator)
         paginator.message = await inter.original_response()
-        await paginator._update_message(inter)
         return paginator
 
 
@@ -137,6 +137,8 @@ class MenuFilePaginator(MenuPaginator):
         assert isinstance(inter.author, disnake.Member)
         assert isinstance(items, dict)
         paginator = cls(inter.author, timeout=timeout, items=items, bot=bot)
+        # the first page is uploaded by editing the original response, which needs one to exist
+        await t.cast("TemplateBot", inter.client).defer(inter)
         paginator.message = await inter.original_response()
         await paginator._update_message(inter)
         return paginator
@@ -1,130 +1,546 @@
 # pyright: reportUnknownVariableType=false
 
+import asyncio
+import contextlib
 import importlib
-import inspect
-import pathlib
 import time
 import typing as t
-import uuid
 
 import asyncpg
 
-from src.utils.constants import BOT_ID, PATHS
+from src.core.errors import DatabaseUnavailable
+from src.core.manifest import load_manifest
+from src.utils.constants import BOT_ID
 
+from .backends import Backend, Pool, create_backend
+from .batch import WriteBehindQueue
+from .breaker import BreakerState, CircuitBreaker
+from .codecs import register_codecs
+from .metrics import PoolMetrics
+from .migrations import MigrationRunner
+from .profiler import QueryProfiler, QueryStats, row_count
+from .session import Session
+from .statements import Statement, StatementRegistry
 from .tables import Table
 
 if t.TYPE_CHECKING:
     from src import TemplateBot
 
-    from .tables import Config
+    from .tables import Activity, Config, GuildConfig, Migrations, Tickets, Timers
 
 
-__all__: tuple[str, ...] = ("Database",)
+__all__: tuple[str, ...] = (
+    "Database",
+    "Session",
+)
+
+
+Query = str | Statement
+REPLICA_LAG = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+# errors that mean the database is unreachable rather than the query being wrong
+UNAVAILABLE: tuple[type[Exception], ...] = (
+    OSError,
+    asyncpg.InterfaceError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+    asyncpg.TooManyConnectionsError,
+    asyncpg.QueryCanceledError,
+)
+# per connection, well above the number of registered statements so none of them is ever evicted
+STATEMENT_CACHE_SIZE = 1024
+R = t.TypeVar("R")
 
 
 class Database:
-    _pool: asyncpg.Pool | None = None  # type: ignore[reportMissingTypeArgument]
+    _pool: Pool | None = None
+    _replica: Pool | None = None
+    _replica_task: asyncio.Task[None] | None = None
+    _listener: asyncpg.Connection | None = None
+    _listener_task: asyncio.Task[None] | None = None
+    replica_lag: float | None = None
+    # set when a read failed on the replica, reads stay on the primary until the next lag check succeeds
+    replica_bypassed: bool = False
+    writes: WriteBehindQueue
+    activity: "Activity"
     config: "Config"
+    guildconfig: "GuildConfig"
+    migrations: "Migrations"
+    tickets: "Tickets"
+    timers: "Timers"
 
-    def __init__(self, bot: "TemplateBot") -> None:
+    def __init__(self, bot: "TemplateBot", backend: Backend | None = None) -> None:
         self.bot = bot
+        self.backend = backend or create_backend(
+            self.bot.config.PGBACKEND, latency=self.bot.config.PGBACKEND_LATENCY_MS / 1000
+        )
+        self.statements = StatementRegistry()
+        self._metrics = PoolMetrics()
+        self._replica_metrics = PoolMetrics()
+        self.profiler = QueryProfiler(
+            threshold=self.bot.config.PGSLOW_QUERY_MS / 1000 or float("inf"),
+            explain=self.bot.config.PGSLOW_QUERY_EXPLAIN,
+        )
+        self._explains: set[asyncio.Task[None]] = set()
+        self.breaker = self._create_breaker()
+        # replica failures fall back to the primary, they must not open the primary's breaker
+        self.replica_breaker = self._create_breaker()
+        self._listeners: dict[str, list[t.Callable[[str | None], t.Any]]] = {}
+        self._listener_stack = contextlib.AsyncExitStack()
+        self.migrator = MigrationRunner(self)
+        self.tables: dict[str, Table[t.Any]] = {}
+        # created up front so close() can always drain it, even after a setup that failed midway
+        self.writes = WriteBehindQueue(
+            self,
+            interval=self.bot.config.PGWRITE_INTERVAL / 1000,
+            batch_size=self.bot.config.PGWRITE_BATCH_SIZE,
+            max_pending=self.bot.config.PGWRITE_MAX_PENDING,
+        )
 
-    async def _create_pool(self) -> None:
-        self._pool = await asyncpg.create_pool(
+    def _create_breaker(self) -> CircuitBreaker:
+        return CircuitBreaker(
+            failure_rate=self.bot.config.PGBREAKER_FAILURE_RATE,
+            min_calls=self.bot.config.PGBREAKER_MIN_CALLS,
+            window=self.bot.config.PGBREAKER_WINDOW,
+            open_for=self.bot.config.PGBREAKER_OPEN_FOR,
+            trials=self.bot.config.PGBREAKER_TRIALS,
+        )
+
+    def _pool_options(self) -> dict[str, t.Any]:
+        return dict(
             user=self.bot.config.PGUSER,
             password=self.bot.config.PGPASSWORD,
             database=self.bot.config.PGDATABASE,
+            min_size=self.bot.config.PGPOOL_MIN_SIZE,
+            max_size=self.bot.config.PGPOOL_MAX_SIZE,
+            max_queries=self.bot.config.PGPOOL_MAX_QUERIES,
+            max_inactive_connection_lifetime=self.bot.config.PGPOOL_MAX_INACTIVE_LIFETIME,
+            command_timeout=self.bot.config.PGCOMMAND_TIMEOUT or None,
+            statement_cache_size=STATEMENT_CACHE_SIZE,
+            init=self._init_connection,
+        )
+
+    async def _init_connection(self, conn: asyncpg.Connection) -> None:
+        """Pool ``init`` hook, codecs are registered before any statement is prepared on the connection."""
+        await register_codecs(conn)
+
+    async def _create_pool(self) -> None:
+        self._pool = await self.backend.create_pool(
             host=self.bot.config.PGHOST,
             port=self.bot.config.PGPORT,
+            **self._pool_options(),
         )
+        if self.bot.config.PGREPLICA_HOST:
+            self._replica = await self.backend.create_pool(
+                host=self.bot.config.PGREPLICA_HOST,
+                port=self.bot.config.PGREPLICA_PORT or self.bot.config.PGPORT,
+                **self._pool_options(),
+            )
+            await self._check_replica()
+            self._replica_task = asyncio.create_task(self._watch_replica(), name="database-replica-lag")
+
+    @property
+    def replica_available(self) -> bool:
+        """Whether reads go to the replica, it has to exist, answer and be within the lag threshold.
+
+        The lag is checked every ``PGREPLICA_LAG_INTERVAL`` seconds. A read the replica fails to answer is
+        retried on the primary, which then serves every read until the next lag check succeeds.
+        """
+        return (
+            not self.replica_bypassed
+            and self.replica_lag is not None
+            and self.replica_lag <= self.bot.config.PGREPLICA_MAX_LAG
+        )
+
+    async def _check_replica(self) -> None:
+        assert self._replica is not None
+        available = self.replica_available
+        try:
+            async with self._replica.acquire() as conn:
+                self.replica_lag = float(await conn.fetchval(REPLICA_LAG))
+            self.replica_bypassed = False
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError, asyncio.TimeoutError) as e:
+            self.replica_lag = None
+            self.bot.logger.warning(f"Failed to check the replica lag: {e}")
+        if available == self.replica_available:
+            return
+        if self.replica_available:
+            self.bot.logger.info(f"Replica lag is {self.replica_lag:.3f}s, routing reads to the replica.")
+        else:
+            self.bot.logger.warning(f"Replica lag is {self.replica_lag}s, routing reads to the primary.")
+
+    def _bypass_replica(self, error: Exception) -> None:
+        if not self.replica_bypassed:
+            cause = error.__cause__ or error
+            self.bot.logger.warning(
+                f"Replica is unavailable, routing reads to the primary until the next lag check: {cause}"
+            )
+        self.replica_bypassed = True
+
+    async def _watch_replica(self) -> None:
+        while True:
+            await asyncio.sleep(self.bot.config.PGREPLICA_LAG_INTERVAL)
+            await self._check_replica()
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        """Acquire wait and query time histograms with freshly sampled in-use/idle gauges."""
+        assert self._pool is not None
+        return self._metrics.sample(self._pool)
+
+    @property
+    def replica_metrics(self) -> PoolMetrics | None:
+        return self._replica_metrics.sample(self._replica) if self._replica is not None else None
+
+    @contextlib.asynccontextmanager
+    async def _acquire(self, *, replica: bool = False, guarded: bool = True) -> t.AsyncIterator[asyncpg.Connection]:
+        """Acquire a pooled connection, failing fast while the pool's breaker is open.
+
+        Only ``guarded`` acquires are held to ``PGQUERY_TIMEOUT`` and counted by the breaker, sessions,
+        migrations and bulk writes may wait as long as they need.
+        """
+        pool, metrics = (self._replica, self._replica_metrics) if replica else (self._pool, self._metrics)
+        breaker = self.replica_breaker if replica else self.breaker
+        assert pool is not None
+        breaker.check()
+        start = time.perf_counter()
+        async with contextlib.AsyncExitStack() as stack:
+            acquire = stack.enter_async_context(pool.acquire())
+            # only failures count, handing out an idle connection says nothing about the server's health
+            conn = await (self._guard(acquire, breaker, successes=False) if guarded else acquire)
+            metrics.acquire.observe(time.perf_counter() - start)
+            yield conn
+
+    async def _guard(self, awaitable: t.Awaitable[R], breaker: CircuitBreaker, *, successes: bool = True) -> R:
+        """Await under ``PGQUERY_TIMEOUT``, feeding the outcome to ``breaker``.
+
+        Timeouts and connection errors are raised as :class:`DatabaseUnavailable`, errors of the query
+        itself still mean the server answered and count as successes.
+        """
+        try:
+            result = await asyncio.wait_for(awaitable, self.bot.config.PGQUERY_TIMEOUT or None)
+        except asyncio.TimeoutError as e:
+            breaker.record_failure(timeout=True)
+            raise DatabaseUnavailable(breaker.retry_after) from e
+        except UNAVAILABLE as e:
+            breaker.record_failure()
+            raise DatabaseUnavailable(breaker.retry_after) from e
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            if successes:
+                breaker.record_success()
+            raise
+        if successes:
+            breaker.record_success()
+        return result
 
     async def setup(self) -> None:
         self.bot.logger.info("Setting up the database...")
         await self._create_pool()
+        self.writes.start()
         await self._setup_extensions()
         await self._apply_migrations()
         await self.config.update_login(BOT_ID)
         self.bot.logger.info("Connected to the database.")
 
     async def close(self) -> None:
-        assert self._pool is not None
         self.bot.logger.info("Closing the database connection...")
-        await self._pool.close()
+        for table in self.tables.values():
+            await table.teardown()
+        if self._pool is not None:
+            await self.writes.close()
+        for task in self._explains:
+            task.cancel()
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.remove_termination_listener(self._listener_lost)
+            for channel in self._listeners:
+                await listener.remove_listener(channel, self._dispatch)
+        await self._listener_stack.aclose()
+        if self._replica_task is not None:
+            self._replica_task.cancel()
+        if self._replica is not None:
+            await self._replica.close()
+        if self._pool is not None:
+            await self._pool.close()
+
+    def _discover_tables(self) -> dict[str, Table[t.Any]]:
+        start = time.perf_counter()
+        tables: dict[str, Table[t.Any]] = {}
+        timings: dict[str, float] = {}
+        for extension in load_manifest().tables:
+            import_start = time.perf_counter()
+            module = importlib.import_module(extension.module)
+            timings[extension.module] = timings.get(extension.module, 0.0) + time.perf_counter() - import_start
+            tables[extension.name] = getattr(module, extension.name)(self)
+            setattr(self, extension.name.lower(), tables[extension.name])
+        report = ", ".join(
+            f"{module.rpartition('.')[2]} {elapsed * 1000:.2f}ms"
+            for module, elapsed in sorted(timings.items(), key=lambda i: -i[1])
+        )
+        self.bot.logger.info(
+            f"Imported {len(timings)} table modules in {(time.perf_counter() - start) * 1000:.2f}ms ({report})."
+        )
+        return tables
+
+    @staticmethod
+    def _setup_order(tables: dict[str, Table[t.Any]]) -> list[str]:
+        order: list[str] = []
+        state: dict[str, bool] = {}
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if name not in tables:
+                raise ValueError(f"Table {path[-1]} depends on unknown table {name}.")
+            if state.get(name) is False:
+                raise ValueError(f"Circular table dependency: {' -> '.join(path + (name,))}")
+            if name in state:
+                return
+            state[name] = False
+            for dependency in type(tables[name]).depends_on:
+                visit(dependency, path + (name,))
+            state[name] = True
+            order.append(name)
+
+        for name in tables:
+            visit(name, ())
+        return order
 
     async def _setup_extensions(self) -> None:
         self.bot.logger.flair("Setting up the database extensions...")
-        extensions = pathlib.Path(PATHS.TABLES)
-        for file in extensions.glob("*.py"):
-            if file.name.startswith("_"):
-                continue
-            module = importlib.import_module(
-                f"{extensions.parent.as_posix().replace('/', '.')}.{extensions.name}.{file.stem}"
-            )
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, Table) and name != "Table":
-                    table = obj(self)
-                    setattr(self, name.lower(), table)
-                    await table.setup()
-                    self.bot.logger.info(f"Loaded table {name}.")
-        self.bot.logger.flair("Finished setting up the database extensions.")
+        start = time.perf_counter()
+        tables = self.tables = self._discover_tables()
+        timings: dict[str, float] = {}
+        tasks: dict[str, asyncio.Task[None]] = {}
+
+        async def setup(name: str) -> None:
+            await asyncio.gather(*(tasks[dependency] for dependency in type(tables[name]).depends_on))
+            table_start = time.perf_counter()
+            await tables[name].setup()
+            timings[name] = time.perf_counter() - table_start
+            self.bot.logger.info(f"Loaded table {name} in {timings[name] * 1000:.2f}ms.")
+
+        # dependencies come first in the order, so every task can look up the ones it waits on
+        for name in self._setup_order(tables):
+            tasks[name] = asyncio.create_task(setup(name), name=f"setup-table-{name}")
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            # let the cancelled setups unwind before the pool they run on is closed
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        report = ", ".join(
+            f"{name} {elapsed * 1000:.2f}ms" for name, elapsed in sorted(timings.items(), key=lambda i: -i[1])
+        )
+        self.bot.logger.flair(
+            f"Finished setting up {len(tables)} database extensions in {(time.perf_counter() - start) * 1000:.2f}ms "
+            f"({report})."
+        )
 
     async def _apply_migrations(self) -> None:
+        await self.migrator.run(
+            dry_run=self.bot.config.PGMIGRATIONS_DRY_RUN,
+            baseline=self.bot.config.PGMIGRATIONS_BASELINE,
+        )
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> t.AsyncIterator[Session]:
+        """Pin one pooled connection for every query made through the yielded session.
+
+        Session queries are not held to ``PGQUERY_TIMEOUT`` and do not feed the circuit breaker, they run
+        migrations, advisory locks and bulk merges that may legitimately take long.
+        """
+        async with self._acquire(guarded=False) as conn:
+            yield Session(self, conn)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self, session: Session | None = None, **kwargs: t.Any) -> t.AsyncIterator[Session]:
+        """Open a transaction on a new session, or a savepoint when ``session`` already is in one."""
+        if session is not None:
+            async with session.transaction(**kwargs):
+                yield session
+            return
+        async with self.session() as session, session.transaction(**kwargs):
+            yield session
+
+    async def listen(self, channel: str, callback: t.Callable[[str | None], t.Any]) -> None:
+        """Call ``callback`` with the payload of every ``NOTIFY`` on ``channel``.
+
+        All channels share one pooled connection held open for the bot's lifetime. When it drops, it is
+        reopened and every callback is called with ``None`` since notifications may have been missed.
+        """
+        if self._listener is None:
+            await self._open_listener()
+        assert self._listener is not None
+        if channel not in self._listeners:
+            await self._listener.add_listener(channel, self._dispatch)
+        self._listeners.setdefault(channel, []).append(callback)
+
+    async def notify(self, channel: str, payload: str, *, session: Session | None = None) -> None:
+        """Send a notification, inside a transaction it is only delivered once the transaction commits."""
+        await (session if session is not None else self).execute("SELECT pg_notify($1, $2)", channel, payload)
+
+    def _dispatch(self, _: t.Any, __: int, channel: str, payload: str) -> None:
+        for callback in self._listeners.get(channel, ()):
+            callback(payload)
+
+    async def _open_listener(self) -> None:
         assert self._pool is not None
-        bot_config = await self.config.get(BOT_ID)
-        migrations = pathlib.Path(PATHS.MIGRATIONS)
-        updates: dict[str, float] = {}
-        applied = {str(m) for m in bot_config.migrations}
-        for file in migrations.glob("*.sql"):
-            ts = float(file.name.split("-")[0])
-            name = file.name.replace(".sql", "").replace(f"{ts}-", "")
-            if name not in applied:
-                updates[name] = ts
-        unapplied = set(updates.keys()) - applied
-        if not unapplied:
-            self.bot.logger.info("No migrations to apply.")
+        self._listener = await self._listener_stack.enter_async_context(self._pool.acquire())
+        self._listener.add_termination_listener(self._listener_lost)
+        for channel in self._listeners:
+            await self._listener.add_listener(channel, self._dispatch)
+
+    def _listener_lost(self, _: t.Any) -> None:
+        self.bot.logger.warning("Lost the LISTEN connection, reconnecting...")
+        self._listener = None
+        self._listener_task = asyncio.create_task(self._reopen_listener(), name="database-listener")
+
+    async def _reopen_listener(self) -> None:
+        await self._listener_stack.aclose()
+        delay = 1.0
+        while True:
+            try:
+                await self._open_listener()
+                break
+            except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as e:
+                self.bot.logger.warning(f"Failed to reopen the LISTEN connection, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+        self.bot.logger.info("Reopened the LISTEN connection.")
+        for callbacks in self._listeners.values():
+            for callback in callbacks:
+                callback(None)
+
+    def prepare(self, name: str, query: str) -> Statement:
+        """Register a named statement, asyncpg prepares it once on every pooled connection that runs it.
+
+        The returned :class:`Statement` is accepted by every query helper in place of the SQL text and records
+        its call count and timings.
+        """
+        return self.statements.register(name, query)
+
+    async def _run(
+        self,
+        conn: asyncpg.Connection,
+        method: str,
+        query: Query,
+        *args: t.Any,
+        replica: bool = False,
+        guarded: bool = True,
+        **kwargs: t.Any,
+    ) -> t.Any:
+        result = None
+        breaker = self.replica_breaker if replica else self.breaker
+        if guarded:
+            breaker.before_call()
+        start = time.perf_counter()
+        try:
+            if isinstance(query, str):
+                call = getattr(conn, method)(query, *args, **kwargs)
+            else:
+                call = self._run_statement(conn, method, query, *args)
+            result = await (self._guard(call, breaker) if guarded else call)
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            if replica:
+                # the profiler and the primary's histograms describe the primary only
+                self._replica_metrics.query.observe(elapsed)
+            else:
+                self._metrics.query.observe(elapsed)
+                self._profile(method, query, args, result, elapsed)
+
+    def _profile(self, method: str, query: Query, args: tuple[t.Any, ...], result: t.Any, elapsed: float) -> None:
+        text, name = (query, None) if isinstance(query, str) else (query.query, query.name)
+        if method == "copy_records_to_table":
+            text = f"COPY {text}"
+        stats = self.profiler.record(text, elapsed, row_count(method, args, result), name=name)
+        if elapsed < self.profiler.threshold:
             return
-        self.bot.logger.warning(f"Applying {len(unapplied)} migrations...")
-        ordered = sorted(unapplied, key=lambda x: updates[x])
-        for migration in ordered:
-            path = migrations / f"{updates[migration]}-{migration}.sql"
+        self.bot.logger.warning(f"Slow query ({elapsed * 1000:.2f}ms): {stats.label[:500]}")
+        if method != "executemany" and self.profiler.should_explain(stats, text):
+            task = asyncio.create_task(self._explain(stats, text, args), name="database-explain")
+            self._explains.add(task)
+            task.add_done_callback(self._explains.discard)
+
+    async def _explain(self, stats: QueryStats, query: str, args: tuple[t.Any, ...]) -> None:
+        """Capture the plan of a slow query, ANALYZE runs it again so the transaction is always rolled back."""
+        try:
+            async with self._acquire(guarded=False) as conn:
+                transaction = conn.transaction()
+                await transaction.start()
+                try:
+                    rows = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {query}", *args)
+                finally:
+                    await transaction.rollback()
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, DatabaseUnavailable, asyncio.TimeoutError) as e:
+            self.bot.logger.warning(f"Failed to explain slow query {stats.label[:200]}: {e}")
+            return
+        stats.plan = "\n".join(row[0] for row in rows)
+        self.bot.logger.warning(f"Plan of slow query {stats.label[:200]}:\n{stats.plan}")
+
+    async def _run_statement(self, conn: asyncpg.Connection, method: str, statement: Statement, *args: t.Any) -> t.Any:
+        start = time.perf_counter()
+        try:
+            # asyncpg's statement cache prepares the query on first use per connection, and prepares it
+            # again when a migration changed the schema under it
+            return await getattr(conn, method)(statement.query, *args)
+        finally:
+            statement.record(time.perf_counter() - start)
+
+    async def defer(self, query: Query, *args: t.Any, key: t.Hashable | None = None) -> None:
+        """Queue a fire-and-forget write, it is sent later in one ``executemany`` per statement.
+
+        The rows of a failed batch are retried with the next flush as long as the buffer has room for them,
+        the rest are dropped and counted in ``writes.stats.failed``. Raises :class:`RuntimeError` once the
+        database is closing.
+        """
+        await self.writes.put(query, *args, key=key)
+
+    async def execute(self, query: Query, *args: t.Any) -> None:
+        async with self._acquire() as conn:
+            await self._run(conn, "execute", query, *args)
+
+    async def _read(self, method: str, query: Query, *args: t.Any, primary: bool) -> t.Any:
+        if not primary and self.replica_available and self.replica_breaker.state is not BreakerState.OPEN:
             try:
-                self.bot.logger.info(f"Applying migration {migration}...")
-                await self._pool.execute(path.read_text())
-                await self.config.update_migration(BOT_ID, uuid.UUID(migration))
-                self.bot.logger.info(f"Applied migration {migration}.")
-            except Exception as e:
-                self.bot.logger.critical(f"Failed to apply migration {migration}! Rolling back...")
-                raise e
-        self.bot.logger.flair("Finished applying migrations.")
-
-    async def execute(self, query: str, *args: t.Any) -> None:
-        assert self._pool is not None
-        async with self._pool.acquire() as conn:
-            await conn.execute(query, *args)
+                async with self._acquire(replica=True) as conn:
+                    return await self._run(conn, method, query, *args, replica=True)
+            except DatabaseUnavailable as e:
+                # rejections of the half open breaker carry no cause, the replica did not fail on them
+                if e.__cause__ is not None:
+                    self._bypass_replica(e)
+            except asyncpg.ReadOnlySQLTransactionError:
+                name = query if isinstance(query, str) else query.name
+                self.bot.logger.warning(f"Write sent to the replica, pass primary=True for: {name}")
+        async with self._acquire() as conn:
+            return await self._run(conn, method, query, *args)
 
-    async def fetch(self, query: str, *args: t.Any) -> t.Any:
-        assert self._pool is not None
-        async with self._pool.acquire() as conn:
-            return await conn.fetch(query, *args)
+    async def fetch(self, query: Query, *args: t.Any, primary: bool = False) -> t.Any:
+        return await self._read("fetch", query, *args, primary=primary)
 
-    async def fetchrow(self, query: str, *args: t.Any) -> t.Any:
-        assert self._pool is not None
-        async with self._pool.acquire() as conn:
-            return await conn.fetchrow(query, *args)
+    async def fetchrow(self, query: Query, *args: t.Any, primary: bool = False) -> t.Any:
+        return await self._read("fetchrow", query, *args, primary=primary)
 
-    async def execute_many(self, query: str, *args: t.Any) -> None:
-        assert self._pool is not None
-        async with self._pool.acquire() as conn:
-            await conn.executemany(query, *args)
+    async def execute_many(self, query: Query, *args: t.Any) -> None:
+        # bulk writes, like the write-behind flushes, are not held to the interactive timeout
+        async with self._acquire(guarded=False) as conn:
+            await self._run(conn, "executemany", query, *args, guarded=False)
 
-    async def fetchval(self, query: str, *args: t.Any) -> t.Any:
-        assert self._pool is not None
-        async with self._pool.acquire() as conn:
-            return await conn.fetchval(query, *args)
+    async def fetchval(self, query: Query, *args: t.Any, primary: bool = False) -> t.Any:
+        return await self._read("fetchval", query, *args, primary=primary)
 
     async def ping(self) -> float:
-        assert self._pool is not None
-        async with self._pool.acquire() as conn:
+        async with self._acquire() as conn:
             start = time.perf_counter()
             await conn.execute("SELECT 1")
             return time.perf_counter() - start
@@ -0,0 +1,20 @@
+from ._backend import Backend, Pool
+from .postgres import PostgresBackend
+from .sqlite import SQLiteBackend
+
+__all__: tuple[str, ...] = (
+    "Backend",
+    "Pool",
+    "PostgresBackend",
+    "SQLiteBackend",
+    "create_backend",
+)
+
+
+def create_backend(name: str, *, latency: float = 0.0) -> Backend:
+    """The backend configured by ``PGBACKEND``, ``latency`` (seconds per query) only applies to SQLite."""
+    if name == PostgresBackend.name:
+        return PostgresBackend()
+    if name == SQLiteBackend.name:
+        return SQLiteBackend(latency=latency)
+    raise ValueError(f"Unknown database backend {name!r}, expected postgres or sqlite.")
@@ -0,0 +1,43 @@
+import abc
+import typing as t
+
+__all__: tuple[str, ...] = (
+    "Backend",
+    "Pool",
+)
+
+
+class Pool(t.Protocol):
+    """The part of ``asyncpg.Pool`` that :class:`~src.database.Database` relies on."""
+
+    def acquire(self) -> t.AsyncContextManager[t.Any]:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+    def get_size(self) -> int:
+        ...
+
+    def get_idle_size(self) -> int:
+        ...
+
+    def get_min_size(self) -> int:
+        ...
+
+    def get_max_size(self) -> int:
+        ...
+
+
+class Backend(abc.ABC):
+    """Creates the connection pools behind :class:`~src.database.Database`.
+
+    Pooled connections expose asyncpg's ``execute``/``fetch``/``fetchrow``/``fetchval``/``executemany``,
+    ``transaction``, ``cursor`` and ``copy_records_to_table``.
+    """
+
+    name: t.ClassVar[str]
+
+    @abc.abstractmethod
+    async def create_pool(self, **options: t.Any) -> Pool:
+        """Open a pool, ``options`` are the keyword arguments of ``asyncpg.create_pool``."""
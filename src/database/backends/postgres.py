@@ -0,0 +1,17 @@
+import typing as t
+
+import asyncpg
+
+from ._backend import Backend, Pool
+
+__all__: tuple[str, ...] = ("PostgresBackend",)
+
+
+class PostgresBackend(Backend):
+    """The production backend, asyncpg pools connected to Postgres."""
+
+    name = "postgres"
+
+    async def create_pool(self, **options: t.Any) -> Pool:
+        pool: Pool = await asyncpg.create_pool(**options)
+        return pool
@@ -0,0 +1,426 @@
+import asyncio
+import contextlib
+import datetime
+import functools
+import itertools
+import pickle
+import re
+import sqlite3
+import time
+import typing as t
+import uuid
+
+import asyncpg
+import attrs
+
+from ..codecs import dumps, loads
+from ._backend import Backend, Pool
+
+__all__: tuple[str, ...] = ("SQLiteBackend",)
+
+
+Latency = float | t.Callable[[str], float]
+LOCK_TIMEOUT = 5.0
+
+_PARAMETER = re.compile(r"\$(\d+)")
+_ANY = re.compile(r"=\s*ANY\s*\(\s*\$(\d+)\s*\)", re.I)
+_CAST = re.compile(r"::\s*\w+(?:\s*\[\])?")
+_ARRAY_TYPE = re.compile(r"\b\w+(?: PRECISION| VARYING)?\s*\[\]", re.I)
+_STAGING = re.compile(r"CREATE TEMP TABLE (\w+) \(LIKE (\w+) INCLUDING DEFAULTS\) ON COMMIT DROP", re.I)
+_INSERT_SELECT = re.compile(r"(SELECT (?:(?!\bWHERE\b).)*? FROM \w+) ON CONFLICT", re.I | re.S)
+_COUNTED = re.compile(r"WITH (\w+) AS \((INSERT .*) RETURNING 1\) SELECT count\(\*\) FROM \1\s*$", re.I | re.S)
+_ADD_COLUMN = re.compile(r"ALTER TABLE (\w+) ADD COLUMN IF NOT EXISTS (\w+)", re.I)
+_COLUMNS = re.compile(r"SELECT column_name FROM information_schema\.columns WHERE .*\btable_name = \$1$", re.I)
+
+
+def _adapt(value: t.Any) -> t.Any:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (datetime.date, datetime.time, uuid.UUID)):
+        return str(value)
+    if isinstance(value, dict):
+        return dumps(value).decode()
+    if isinstance(value, (list, tuple)):
+        return pickle.dumps(value)
+    return value
+
+
+def _json(value: bytes) -> t.Any:
+    # lists bound for JSON columns are pickled like arrays, objects and SQL defaults are JSON text
+    return pickle.loads(value) if value[:1] == b"\x80" else loads(value)
+
+
+for _name, _converter in (
+    ("TIMESTAMP", lambda v: datetime.datetime.fromisoformat(v.decode())),
+    ("TIMESTAMPTZ", lambda v: datetime.datetime.fromisoformat(v.decode())),
+    ("DATE", lambda v: datetime.date.fromisoformat(v.decode())),
+    ("BOOLEAN", lambda v: bool(int(v))),
+    ("UUID", lambda v: uuid.UUID(v.decode())),
+    ("PGARRAY", pickle.loads),
+    ("JSON", _json),
+    ("JSONB", _json),
+):
+    sqlite3.register_converter(_name, _converter)
+
+
+def _array_append(array: bytes | None, value: t.Any) -> bytes:
+    return pickle.dumps([*(pickle.loads(array) if array else ()), value])
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(sep=" ")
+
+
+def _error(error: sqlite3.Error) -> asyncpg.PostgresError:
+    message = str(error)
+    if isinstance(error, sqlite3.IntegrityError):
+        if "UNIQUE" in message:
+            return asyncpg.UniqueViolationError(message)
+        if "NOT NULL" in message:
+            return asyncpg.NotNullViolationError(message)
+        if "FOREIGN KEY" in message:
+            return asyncpg.ForeignKeyViolationError(message)
+        return asyncpg.IntegrityConstraintViolationError(message)
+    if "syntax error" in message:
+        return asyncpg.PostgresSyntaxError(message)
+    if "no such table" in message:
+        return asyncpg.UndefinedTableError(message)
+    if "no such column" in message:
+        return asyncpg.UndefinedColumnError(message)
+    return asyncpg.PostgresError(message)
+
+
+@attrs.define(frozen=True, slots=True)
+class _Query:
+    """A Postgres query rewritten for SQLite, ``arrays`` are the parameters bound as JSON for ``= ANY``."""
+
+    sql: str
+    arrays: frozenset[int] = frozenset()
+    add_column: tuple[str, str] | None = None
+    counted: bool = False
+
+    def parameters(self, args: t.Sequence[t.Any]) -> tuple[t.Any, ...]:
+        if not self.arrays:
+            return tuple(_adapt(arg) for arg in args)
+        return tuple(
+            dumps([_adapt(item) for item in arg]).decode() if i in self.arrays else _adapt(arg)
+            for i, arg in enumerate(args, 1)
+        )
+
+
+@functools.lru_cache(maxsize=1024)
+def _translate(query: str) -> _Query:
+    """Rewrite the Postgres dialect generated by the schema and used by the tables into SQLite."""
+    if _COLUMNS.match(query):
+        return _Query("SELECT name FROM pragma_table_info(?1)")
+    sql = _CAST.sub("", query)
+    arrays = frozenset(int(i) for i in _ANY.findall(sql))
+    sql = _PARAMETER.sub(r"?\1", _ANY.sub(r"IN (SELECT value FROM json_each($\1))", sql))
+    if sql.lstrip()[:6].upper() in ("CREATE", "ALTER "):
+        sql = _ARRAY_TYPE.sub("PGARRAY", sql)
+    sql = _STAGING.sub(r"CREATE TEMP TABLE \1 AS SELECT * FROM \2 WHERE 0", sql)
+    # SQLite cannot tell an ON CONFLICT clause from a join constraint without a WHERE in INSERT ... SELECT
+    sql = _INSERT_SELECT.sub(r"\1 WHERE true ON CONFLICT", sql)
+    if match := _COUNTED.match(sql.strip()):
+        return _Query(match.group(2), arrays, counted=True)
+    if match := _ADD_COLUMN.match(sql.strip()):
+        sql = _ADD_COLUMN.sub(r"ALTER TABLE \1 ADD COLUMN \2", sql, count=1)
+        return _Query(sql, arrays, add_column=(match.group(1), match.group(2)))
+    return _Query(sql, arrays)
+
+
+def _split(script: str) -> list[str]:
+    """Split a script on the semicolons outside of quotes and comments."""
+    statements: list[str] = []
+    start = 0
+    quote: str | None = None
+    i = 0
+    while i < len(script):
+        char = script[i]
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif script.startswith("--", i):
+            i = script.find("\n", i)
+            if i == -1:
+                break
+        elif char == ";":
+            statements.append(script[start:i])
+            start = i + 1
+        i += 1
+    statements.append(script[start:])
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def _status(sql: str, cursor: sqlite3.Cursor) -> str:
+    verb = sql.lstrip().split(None, 1)[0].upper()
+    if verb == "INSERT":
+        return f"INSERT 0 {cursor.rowcount}"
+    if verb in ("UPDATE", "DELETE"):
+        return f"{verb} {cursor.rowcount}"
+    return verb
+
+
+class SQLiteTransaction:
+    """``asyncpg.transaction.Transaction`` counterpart, nested transactions become savepoints."""
+
+    def __init__(self, connection: "SQLiteConnection") -> None:
+        self._connection = connection
+        self._savepoint: str | None = None
+
+    async def start(self) -> None:
+        depth = self._connection._depth
+        self._savepoint = f"_sp{depth}" if depth else None
+        await self._connection._call(
+            self._connection._raw.execute, f"SAVEPOINT {self._savepoint}" if depth else "BEGIN"
+        )
+        self._connection._depth += 1
+
+    async def commit(self) -> None:
+        self._connection._depth -= 1
+        statement = f"RELEASE {self._savepoint}" if self._savepoint else "COMMIT"
+        await self._connection._call(self._connection._raw.execute, statement)
+
+    async def rollback(self) -> None:
+        self._connection._depth -= 1
+        if self._savepoint:
+            self._connection._raw.execute(f"ROLLBACK TO {self._savepoint}")
+            self._connection._raw.execute(f"RELEASE {self._savepoint}")
+        else:
+            self._connection._raw.execute("ROLLBACK")
+
+    async def __aenter__(self) -> "SQLiteTransaction":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, *_: t.Any) -> None:
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+
+class SQLiteConnection:
+    """One SQLite connection with the subset of the ``asyncpg.Connection`` API the database layer uses."""
+
+    def __init__(
+        self,
+        raw: sqlite3.Connection,
+        latency: t.Callable[[str], float],
+        listeners: dict[str, list[tuple["SQLiteConnection", t.Callable[..., t.Any]]]],
+    ) -> None:
+        self._raw = raw
+        self._latency = latency
+        self._listeners = listeners
+        self._depth = 0
+
+    async def _call(self, function: t.Callable[..., t.Any], *args: t.Any) -> t.Any:
+        # shared cache connections lock per table, a conflicting writer waits for the holder like in Postgres
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                return function(*args)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e):
+                    raise _error(e) from e
+                if time.monotonic() > deadline:
+                    raise asyncpg.DeadlockDetectedError(str(e)) from e
+                await asyncio.sleep(0.001)
+            except sqlite3.Error as e:
+                raise _error(e) from e
+
+    def _atomic(self, function: t.Callable[..., t.Any], *args: t.Any) -> t.Any:
+        self._raw.execute("SAVEPOINT _atomic")
+        try:
+            result = function(*args)
+        except BaseException:
+            self._raw.execute("ROLLBACK TO _atomic")
+            self._raw.execute("RELEASE _atomic")
+            raise
+        self._raw.execute("RELEASE _atomic")
+        return result
+
+    async def _wait(self, query: str) -> None:
+        if latency := self._latency(query):
+            await asyncio.sleep(latency)
+
+    def _column_exists(self, table: str, column: str) -> bool:
+        return any(row[1] == column for row in self._raw.execute(f"PRAGMA table_info({table})"))
+
+    def _run(self, query: str, args: t.Sequence[t.Any]) -> tuple[sqlite3.Cursor | None, list[t.Any]]:
+        translated = _translate(query)
+        if translated.add_column is not None and self._column_exists(*translated.add_column):
+            return None, []
+        cursor = self._raw.execute(translated.sql, translated.parameters(args))
+        if translated.counted:
+            return cursor, [(cursor.rowcount,)]
+        return cursor, cursor.fetchall()
+
+    def _script(self, script: str) -> str:
+        status = ""
+        for statement in _split(script):
+            cursor, _ = self._run(statement, ())
+            status = _status(statement, cursor) if cursor is not None else "ALTER TABLE"
+        return status
+
+    async def execute(self, query: str, *args: t.Any, timeout: float | None = None) -> str:
+        await self._wait(query)
+        if not args:
+            return await self._call(self._atomic, self._script, query)
+        cursor, _ = await self._call(self._run, query, args)
+        return _status(query, cursor) if cursor is not None else "ALTER TABLE"
+
+    async def fetch(self, query: str, *args: t.Any, timeout: float | None = None) -> list[t.Any]:
+        await self._wait(query)
+        _, rows = await self._call(self._run, query, args)
+        return rows
+
+    async def fetchrow(self, query: str, *args: t.Any, timeout: float | None = None) -> t.Any:
+        rows = await self.fetch(query, *args)
+        return rows[0] if rows else None
+
+    async def fetchval(self, query: str, *args: t.Any, column: int = 0, timeout: float | None = None) -> t.Any:
+        row = await self.fetchrow(query, *args)
+        return row[column] if row is not None else None
+
+    async def executemany(
+        self, query: str, args: t.Iterable[t.Sequence[t.Any]], *, timeout: float | None = None
+    ) -> None:
+        await self._wait(query)
+        translated = _translate(query)
+        rows = [translated.parameters(arg) for arg in args]
+        await self._call(self._atomic, self._raw.executemany, translated.sql, rows)
+
+    async def copy_records_to_table(
+        self,
+        table: str,
+        *,
+        records: t.Iterable[t.Sequence[t.Any]],
+        columns: t.Sequence[str],
+        timeout: float | None = None,
+    ) -> str:
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        await self._wait(query)
+        rows = [tuple(_adapt(value) for value in record) for record in records]
+        await self._call(self._atomic, self._raw.executemany, query, rows)
+        return f"COPY {len(rows)}"
+
+    async def cursor(self, query: str, *args: t.Any, prefetch: int | None = None) -> t.AsyncIterator[t.Any]:
+        await self._wait(query)
+        translated = _translate(query)
+        cursor: sqlite3.Cursor = await self._call(self._raw.execute, translated.sql, translated.parameters(args))
+        while rows := cursor.fetchmany(prefetch or 50):
+            for row in rows:
+                yield row
+            await asyncio.sleep(0)
+
+    def transaction(self, **_: t.Any) -> SQLiteTransaction:
+        return SQLiteTransaction(self)
+
+    async def add_listener(self, channel: str, callback: t.Callable[..., t.Any]) -> None:
+        self._listeners.setdefault(channel, []).append((self, callback))
+
+    async def remove_listener(self, channel: str, callback: t.Callable[..., t.Any]) -> None:
+        self._listeners[channel].remove((self, callback))
+
+    def add_termination_listener(self, _: t.Callable[..., t.Any]) -> None:
+        pass
+
+    def remove_termination_listener(self, _: t.Callable[..., t.Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        self._raw.close()
+
+
+class SQLitePool:
+    def __init__(self, backend: "SQLiteBackend", min_size: int, max_size: int) -> None:
+        self._backend = backend
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle = [backend.connect() for _ in range(min_size)]
+        self._size = min_size
+        self._semaphore = asyncio.Semaphore(max_size)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> t.AsyncIterator[SQLiteConnection]:
+        async with self._semaphore:
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                connection = self._backend.connect()
+                self._size += 1
+            try:
+                yield connection
+            finally:
+                if connection._raw.in_transaction:
+                    connection._raw.rollback()
+                connection._depth = 0
+                self._idle.append(connection)
+
+    async def close(self) -> None:
+        for connection in self._idle:
+            connection.close()
+        self._idle.clear()
+        self._size = 0
+
+    def get_size(self) -> int:
+        return self._size
+
+    def get_idle_size(self) -> int:
+        return len(self._idle)
+
+    def get_min_size(self) -> int:
+        return self._min_size
+
+    def get_max_size(self) -> int:
+        return self._max_size
+
+
+class SQLiteBackend(Backend):
+    """An in-process stand-in for Postgres on a shared in-memory SQLite database.
+
+    It understands the queries generated by :class:`~src.database.schema.Schema` and used by the tables,
+    so handlers can be benchmarked and tested without a server. ``latency`` adds a simulated round trip
+    to every query, either in seconds or computed from the query text. Isolation is read uncommitted and
+    ``pg_notify`` reaches the listeners of the same backend right away instead of on commit.
+    """
+
+    name = "sqlite"
+    _ids = itertools.count()
+
+    def __init__(self, *, latency: Latency = 0.0) -> None:
+        self._latency = latency if callable(latency) else lambda _: latency
+        self._listeners: dict[str, list[tuple[SQLiteConnection, t.Callable[..., t.Any]]]] = {}
+        self._uri = f"file:ticketbot-{next(self._ids)}?mode=memory&cache=shared"
+        # the in-memory database lives as long as one connection to it is open
+        self._anchor = self.connect()
+
+    def connect(self) -> SQLiteConnection:
+        raw = sqlite3.connect(
+            self._uri,
+            uri=True,
+            isolation_level=None,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+        )
+        raw.row_factory = sqlite3.Row
+        raw.execute("PRAGMA read_uncommitted = true")
+        raw.create_function("now", 0, _now)
+        raw.create_function("array_append", 2, _array_append)
+        raw.create_function("pg_notify", 2, self._notify)
+        for lock in ("pg_advisory_lock", "pg_advisory_unlock", "pg_try_advisory_lock"):
+            raw.create_function(lock, 1, lambda _: True)
+        return SQLiteConnection(raw, self._latency, self._listeners)
+
+    def _notify(self, channel: str, payload: str) -> None:
+        loop = asyncio.get_running_loop()
+        for connection, callback in self._listeners.get(channel, ()):
+            loop.call_soon(callback, connection, 0, channel, payload)
+
+    async def create_pool(self, *, min_size: int = 10, max_size: int = 10, **_: t.Any) -> Pool:
+        return SQLitePool(self, min_size, max_size)
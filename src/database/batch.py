@@ -0,0 +1,146 @@
+import asyncio
+import itertools
+import time
+import typing as t
+
+import attrs
+
+if t.TYPE_CHECKING:
+    from . import Database, Query
+
+
+__all__: tuple[str, ...] = (
+    "WriteBehindQueue",
+    "WriteStats",
+)
+
+
+@attrs.define(slots=True)
+class WriteStats:
+    """Counters describing the work done by a write-behind queue."""
+
+    queued: int = 0
+    coalesced: int = 0
+    written: int = 0
+    # rows of failed flushes that did not fit back into the buffer
+    failed: int = 0
+    retried: int = 0
+    flushes: int = 0
+    round_trips: int = 0
+    waits: int = 0
+    flush_time: float = 0.0
+
+
+class WriteBehindQueue:
+    """Buffers fire-and-forget writes and sends them grouped by statement through ``executemany``.
+
+    A flush happens every ``interval`` seconds, as soon as one statement has ``batch_size`` rows pending
+    and when the queue is closed. Writers wait once ``max_pending`` rows are buffered, rows only free their
+    room once they are written. The rows of a failed ``executemany`` are retried with the next flush.
+    """
+
+    def __init__(self, database: "Database", *, interval: float, batch_size: int, max_pending: int) -> None:
+        self.db = database
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.stats = WriteStats()
+        self._pending: dict["Query", dict[t.Any, tuple[t.Any, ...]]] = {}
+        self._size = 0
+        self._keys = itertools.count()
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._worker(), name="database-write-behind")
+
+    async def put(self, query: "Query", *args: t.Any, key: t.Hashable | None = None) -> None:
+        """Queue a write, a ``key`` coalesces it with a pending write of the same statement and key."""
+        while True:
+            if self._closing:
+                raise RuntimeError("The write-behind queue is closed.")
+            if self._size < self.max_pending:
+                break
+            self.stats.waits += 1
+            self._drained.clear()
+            self._wake.set()
+            await self._drained.wait()
+        rows = self._pending.setdefault(query, {})
+        if key is not None and key in rows:
+            self.stats.coalesced += 1
+        else:
+            self._size += 1
+        rows[next(self._keys) if key is None else key] = args
+        self.stats.queued += 1
+        if len(rows) >= self.batch_size:
+            self._wake.set()
+
+    def _requeue(self, failed: dict["Query", dict[t.Any, tuple[t.Any, ...]]]) -> None:
+        for query, rows in failed.items():
+            newer = self._pending.get(query, {})
+            kept: dict[t.Any, tuple[t.Any, ...]] = {}
+            for key, args in rows.items():
+                # a write queued with the same key during the flush replaces the failed one
+                if key in newer:
+                    continue
+                if self._size >= self.max_pending:
+                    self.stats.failed += 1
+                    continue
+                kept[key] = args
+                self._size += 1
+            self.stats.retried += len(kept)
+            if kept or newer:
+                # the failed rows were queued first and run first, so they cannot overwrite newer writes
+                self._pending[query] = kept | newer
+
+    async def flush(self) -> None:
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            start = time.perf_counter()
+            failed: dict["Query", dict[t.Any, tuple[t.Any, ...]]] = {}
+            for query, rows in pending.items():
+                batch = list(rows.values())
+                try:
+                    await self.db.execute_many(query, batch)
+                except Exception as e:
+                    failed[query] = rows
+                    self.db.bot.logger.error(f"Failed to flush {len(batch)} queued writes, retrying them: {e}")
+                else:
+                    self.stats.written += len(batch)
+                self.stats.round_trips += 1
+            # writers waiting for room are only let through once the flushed rows are written
+            self._size = sum(len(rows) for rows in self._pending.values())
+            self._requeue(failed)
+            if self._size < self.max_pending:
+                self._drained.set()
+            self.stats.flushes += 1
+            self.stats.flush_time += time.perf_counter() - start
+
+    async def _worker(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def close(self) -> None:
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+        # writers still waiting for room raise instead of queueing rows nothing would flush
+        self._drained.set()
@@ -0,0 +1,132 @@
+import collections
+import enum
+import time
+
+import attrs
+
+from src.core.errors import DatabaseUnavailable
+
+__all__: tuple[str, ...] = (
+    "BreakerState",
+    "BreakerStats",
+    "CircuitBreaker",
+)
+
+
+class BreakerState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half open"
+
+
+@attrs.define(slots=True)
+class BreakerStats:
+    successes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    trips: int = 0
+
+
+class CircuitBreaker:
+    """Fails database calls fast while too many of them recently errored or timed out.
+
+    The breaker opens once at least ``min_calls`` calls within the last ``window`` seconds failed at
+    ``failure_rate`` or more. After ``open_for`` seconds it lets ``trials`` calls through half open,
+    closing again when they all succeed and reopening on the first failure.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_rate: float = 0.5,
+        min_calls: int = 20,
+        window: float = 10.0,
+        open_for: float = 5.0,
+        trials: int = 3,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_for = open_for
+        self.trials = trials
+        self.stats = BreakerStats()
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._in_trial = 0
+        self._trial_successes = 0
+        # (monotonic time, failed) of the calls within the window
+        self._calls: collections.deque[tuple[float, bool]] = collections.deque()
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state is BreakerState.OPEN and time.monotonic() - self._opened_at >= self.open_for:
+            self._state = BreakerState.HALF_OPEN
+            self._in_trial = self._trial_successes = 0
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, self.open_for - (time.monotonic() - self._opened_at))
+
+    def _prune(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    @property
+    def recent_failure_rate(self) -> float:
+        self._prune(time.monotonic())
+        return sum(failed for _, failed in self._calls) / len(self._calls) if self._calls else 0.0
+
+    def check(self) -> None:
+        """Raise :class:`DatabaseUnavailable` while open, without taking a half open trial."""
+        if self.state is BreakerState.OPEN:
+            self.stats.rejected += 1
+            raise DatabaseUnavailable(self.retry_after)
+
+    def before_call(self) -> None:
+        """Raise :class:`DatabaseUnavailable` when the call is not let through."""
+        state = self.state
+        if state is BreakerState.CLOSED:
+            return
+        if state is BreakerState.HALF_OPEN and self._in_trial < self.trials:
+            self._in_trial += 1
+            return
+        self.stats.rejected += 1
+        raise DatabaseUnavailable(self.retry_after)
+
+    def release(self) -> None:
+        """Give back the half open trial of a call that was cancelled before it had a result."""
+        if self._state is BreakerState.HALF_OPEN and self._in_trial:
+            self._in_trial -= 1
+
+    def record_success(self) -> None:
+        self.stats.successes += 1
+        if self._state is BreakerState.HALF_OPEN:
+            self._trial_successes += 1
+            if self._trial_successes >= self.trials:
+                self._state = BreakerState.CLOSED
+                self._calls.clear()
+            return
+        self._record(False)
+
+    def record_failure(self, *, timeout: bool = False) -> None:
+        self.stats.failures += 1
+        self.stats.timeouts += timeout
+        if self._state is BreakerState.HALF_OPEN:
+            self._trip()
+            return
+        self._record(True)
+
+    def _record(self, failed: bool) -> None:
+        now = time.monotonic()
+        self._calls.append((now, failed))
+        self._prune(now)
+        if self._state is BreakerState.CLOSED and len(self._calls) >= self.min_calls:
+            if sum(failed for _, failed in self._calls) / len(self._calls) >= self.failure_rate:
+                self._trip()
+
+    def _trip(self) -> None:
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self.stats.trips += 1
@@ -0,0 +1,93 @@
+import collections
+import time
+import typing as t
+
+import attrs
+
+__all__: tuple[str, ...] = (
+    "LRUCache",
+    "CacheStats",
+)
+
+
+K = t.TypeVar("K")
+V = t.TypeVar("V")
+
+
+@attrs.define(slots=True)
+class CacheStats:
+    """Counters describing how a cache has been used."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class LRUCache(t.Generic[K, V]):
+    """A bounded least recently used cache with an optional time to live per entry."""
+
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: collections.OrderedDict[K, tuple[float, V]] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and not self._expired(entry[0])
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if self._expired(entry[0]):
+            # expired entries stay until evicted or replaced, stale() serves them during outages
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return entry[1]
+
+    def peek(self, key: K) -> V | None:
+        """Return a live entry without touching its recency or the counters."""
+        entry = self._data.get(key)
+        if entry is None or self._expired(entry[0]):
+            return None
+        return entry[1]
+
+    def stale(self, key: K) -> V | None:
+        """Return an entry even when it expired, without touching its recency or the counters."""
+        entry = self._data.get(key)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
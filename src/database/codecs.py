@@ -0,0 +1,93 @@
+import datetime
+import decimal
+import json
+import typing as t
+import uuid
+
+import attrs
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+if t.TYPE_CHECKING:
+    import asyncpg
+
+
+__all__: tuple[str, ...] = (
+    "dumps",
+    "loads",
+    "register_codecs",
+    "structure",
+    "unstructure",
+)
+# pyright: reportMissingTypeArgument=false
+
+
+# binary jsonb is the JSON text prefixed with a format version byte
+JSONB_VERSION = b"\x01"
+
+
+def _default(value: t.Any) -> t.Any:
+    """Serialize the types orjson handles natively the way it does, and decimals as strings in both."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        # a string keeps the exact value, a float would round it
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+if orjson is not None:
+
+    def dumps(value: t.Any) -> bytes:
+        return orjson.dumps(value, default=_default)
+
+    def loads(data: bytes | str) -> t.Any:
+        return orjson.loads(data)
+
+else:
+
+    def dumps(value: t.Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default).encode()
+
+    def loads(data: bytes | str) -> t.Any:
+        return json.loads(data)
+
+
+def _encode_jsonb(value: t.Any) -> bytes:
+    return JSONB_VERSION + dumps(value)
+
+
+def _decode_jsonb(data: bytes) -> t.Any:
+    return loads(data[1:])
+
+
+async def register_codecs(conn: "asyncpg.Connection") -> None:
+    """Exchange json and jsonb in the binary format, skipping asyncpg's text round trip."""
+    await conn.set_type_codec(
+        "jsonb", encoder=_encode_jsonb, decoder=_decode_jsonb, schema="pg_catalog", format="binary"
+    )
+    await conn.set_type_codec("json", encoder=dumps, decoder=loads, schema="pg_catalog", format="binary")
+
+
+def unstructure(value: t.Any) -> t.Any:
+    """An attrs instance as the plain dict stored in a JSON column."""
+    return attrs.asdict(value) if attrs.has(type(value)) else value
+
+
+def structure(cls: type[t.Any], value: t.Any) -> t.Any:
+    """Rebuild ``cls`` from the dict :func:`unstructure` produced, nested attrs fields included."""
+    if value is None or not attrs.has(cls):
+        return value
+    fields = attrs.fields_dict(attrs.resolve_types(cls))
+    return cls(
+        **{
+            name: structure(fields[name].type, item) if isinstance(item, dict) and name in fields else item
+            for name, item in value.items()
+            if name in fields
+        }
+    )
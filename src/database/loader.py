@@ -0,0 +1,87 @@
+import asyncio
+import typing as t
+
+import attrs
+
+__all__: tuple[str, ...] = (
+    "BatchLoader",
+    "LoaderStats",
+)
+
+
+K = t.TypeVar("K", bound=t.Hashable)
+V = t.TypeVar("V")
+
+
+@attrs.define(slots=True)
+class LoaderStats:
+    requests: int = 0
+    deduplicated: int = 0
+    batches: int = 0
+    keys: int = 0
+
+    @property
+    def mean_batch(self) -> float:
+        return self.keys / self.batches if self.batches else 0.0
+
+
+class BatchLoader(t.Generic[K, V]):
+    """Coalesces the keys requested within one event loop tick into a single ``load`` call.
+
+    Concurrent requests for a key that is already queued or being loaded share its result.
+    ``load`` receives the distinct keys and returns the values it found, missing keys resolve to ``None``.
+    """
+
+    def __init__(self, load: t.Callable[[list[K]], t.Awaitable[t.Mapping[K, V]]], *, max_batch: int = 1000) -> None:
+        self._load = load
+        self.max_batch = max_batch
+        self.stats = LoaderStats()
+        self._queued: dict[K, asyncio.Future[V | None]] = {}
+        self._loading: dict[K, asyncio.Future[V | None]] = {}
+        self._scheduled = False
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V | None:
+        self.stats.requests += 1
+        future = self._queued.get(key) or self._loading.get(key)
+        if future is not None:
+            self.stats.deduplicated += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._queued[key] = loop.create_future()
+            if not self._scheduled:
+                # call_soon runs after every task already woken in this tick had the chance to queue its key
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        # one caller being cancelled must not cancel the result the others wait on
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        queued, self._queued = self._queued, {}
+        self._scheduled = False
+        self._loading.update(queued)
+        keys = list(queued)
+        for i in range(0, len(keys), self.max_batch):
+            batch = {key: queued[key] for key in keys[i : i + self.max_batch]}
+            task = asyncio.create_task(self._run(batch), name="batch-loader")
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future[V | None]]) -> None:
+        self.stats.batches += 1
+        self.stats.keys += len(batch)
+        try:
+            values = await self._load(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # mark it retrieved, callers that were cancelled in the meantime would log it otherwise
+                    future.exception()
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(values.get(key))
+        finally:
+            for key in batch:
+                self._loading.pop(key, None)
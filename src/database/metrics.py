@@ -0,0 +1,99 @@
+import bisect
+import typing as t
+
+import attrs
+
+if t.TYPE_CHECKING:
+    import asyncpg
+
+
+__all__: tuple[str, ...] = (
+    "Histogram",
+    "PoolMetrics",
+)
+# pyright: reportMissingTypeArgument=false
+
+
+BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """A fixed bucket latency histogram in seconds, cheap enough to update on every query."""
+
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` (0-1) percentile, capped at the largest value seen."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+@attrs.define(slots=True)
+class PoolMetrics:
+    """Connection pool gauges together with acquire wait and query time histograms."""
+
+    acquire: Histogram = attrs.field(factory=Histogram)
+    query: Histogram = attrs.field(factory=Histogram)
+    size: int = 0
+    idle: int = 0
+    min_size: int = 0
+    max_size: int = 0
+
+    @property
+    def in_use(self) -> int:
+        return self.size - self.idle
+
+    def sample(self, pool: "asyncpg.Pool") -> "PoolMetrics":
+        self.size = pool.get_size()
+        self.idle = pool.get_idle_size()
+        self.min_size = pool.get_min_size()
+        self.max_size = pool.get_max_size()
+        return self
@@ -0,0 +1,208 @@
+import asyncio
+import datetime
+import hashlib
+import pathlib
+import time
+import typing as t
+import uuid
+import zlib
+
+import attrs
+
+from src.core.errors import MigrationError
+from src.utils.constants import BOT_ID, PATHS
+
+from .models import Migration
+
+if t.TYPE_CHECKING:
+    from src.core.logger import Logger
+
+    from . import Database, Session
+
+
+__all__: tuple[str, ...] = (
+    "MigrationFile",
+    "MigrationRunner",
+)
+
+
+LOCK_KEY: int = zlib.crc32(b"ticketbot:migrations")
+COLUMNS = "SELECT column_name FROM information_schema.columns WHERE table_schema = current_schema() AND table_name = $1"
+
+
+class _DryRun(Exception):
+    """Raised to roll back the bookkeeping a dry run does while planning."""
+
+
+@attrs.define(frozen=True, slots=True)
+class MigrationFile:
+    """A ``<timestamp>-<uuid>.sql`` file on disk, baselines are named ``<timestamp>-baseline.sql``."""
+
+    id: uuid.UUID | None
+    timestamp: float
+    path: pathlib.Path
+    sql: str
+    checksum: str
+
+    @classmethod
+    def read(cls, path: pathlib.Path) -> "MigrationFile":
+        timestamp, _, name = path.stem.partition("-")
+        # normalise line endings so a checkout on another platform does not look like an edit
+        sql = path.read_bytes().replace(b"\r\n", b"\n")
+        return cls(
+            id=None if name == "baseline" else uuid.UUID(name),
+            timestamp=float(timestamp),
+            path=path,
+            sql=sql.decode("utf-8"),
+            checksum=hashlib.sha256(sql).hexdigest(),
+        )
+
+
+class MigrationRunner:
+    """Applies ``src/bin/migrations`` under a Postgres advisory lock.
+
+    Every migration runs in its own transaction together with its ledger row, which stores the file's
+    checksum so edits to already applied migrations are caught on the next start. A fresh database starts
+    from the newest baseline snapshot in ``src/bin/migrations/baseline`` instead of replaying every file
+    older than it. Columns added to a table's model are added to the existing table before planning.
+    """
+
+    def __init__(self, database: "Database") -> None:
+        self.db = database
+
+    @property
+    def logger(self) -> "Logger":
+        return self.db.bot.logger
+
+    @staticmethod
+    def _read_all(folder: pathlib.Path) -> list[MigrationFile]:
+        return sorted((MigrationFile.read(path) for path in folder.glob("*.sql")), key=lambda m: m.timestamp)
+
+    async def _add_columns(self, session: "Session") -> None:
+        """Adds the columns declared on the table models that existing tables are still missing.
+
+        Only missing columns are altered, a start without model changes takes no table locks.
+        """
+        async with self.db.transaction(session):
+            for table in self.db.tables.values():
+                schema = table.schema
+                existing = {row[0] for row in await session.fetch(COLUMNS, schema.table)}
+                for column in schema.columns:
+                    if column.name not in existing and not column.primary_key:
+                        self.logger.warning(f"Adding column {column.name} to table {schema.table}...")
+                        await session.execute(f"ALTER TABLE {schema.table} ADD COLUMN {column.ddl}")
+
+    async def _adopt_legacy(self, session: "Session", files: dict[uuid.UUID, MigrationFile]) -> None:
+        """Moves migrations recorded in the old ``config.migrations`` array into the ledger."""
+        applied = {m.id for m in await self.db.migrations.get_all(session=session)}
+        config = await self.db.config.get(BOT_ID, session=session)
+        for migration_id in config.migrations:
+            if migration_id in applied or (file := files.get(migration_id)) is None:
+                continue
+            await self.db.migrations.create(
+                Migration(migration_id, file.timestamp, file.checksum, datetime.datetime.now(), 0.0, False),
+                session=session,
+            )
+            self.logger.info(f"Adopted legacy migration {migration_id} into the ledger.")
+
+    async def _apply_baseline(self, session: "Session", files: list[MigrationFile]) -> bool:
+        baselines = await asyncio.to_thread(self._read_all, pathlib.Path(PATHS.BASELINES))
+        if not baselines:
+            return False
+        baseline = baselines[-1]
+        covered = [file for file in files if file.id is not None and file.timestamp <= baseline.timestamp]
+        self.logger.warning(
+            f"Fresh database, applying baseline {baseline.path.name} covering {len(covered)} migrations..."
+        )
+        start = time.perf_counter()
+        async with self.db.transaction(session):
+            await session.execute(baseline.sql)
+            for file in covered:
+                assert file.id is not None
+                await self.db.migrations.create(
+                    Migration(file.id, file.timestamp, file.checksum, datetime.datetime.now(), 0.0, True),
+                    session=session,
+                )
+        self.logger.info(f"Applied baseline {baseline.path.name} in {time.perf_counter() - start:.3f}s.")
+        return True
+
+    async def plan(self, session: "Session", *, baseline: bool = False) -> list[MigrationFile]:
+        """The migrations that still have to be applied, in order. Raises on edited or malformed files."""
+        await self._add_columns(session)
+        files = await asyncio.to_thread(self._read_all, pathlib.Path(PATHS.MIGRATIONS))
+        by_id = {file.id: file for file in files if file.id is not None}
+        await self._adopt_legacy(session, by_id)
+        ledger = {m.id: m for m in await self.db.migrations.get_all(session=session)}
+        if not ledger and baseline and await self._apply_baseline(session, files):
+            ledger = {m.id: m for m in await self.db.migrations.get_all(session=session)}
+        edited = [
+            file.path.name
+            for file in by_id.values()
+            if (applied := ledger.get(file.id)) is not None and applied.checksum != file.checksum
+        ]
+        if edited:
+            raise MigrationError(f"Already applied migrations were edited: {', '.join(edited)}")
+        for missing in ledger.keys() - by_id.keys():
+            self.logger.warning(f"Migration {missing} is recorded in the ledger but its file is missing.")
+        return [file for file in by_id.values() if file.id not in ledger]
+
+    async def run(self, *, dry_run: bool = False, baseline: bool = True) -> list[MigrationFile]:
+        start = time.perf_counter()
+        async with self.db.session() as session:
+            await session.execute("SELECT pg_advisory_lock($1)", LOCK_KEY)
+            try:
+                self.logger.info(f"Acquired the migration lock in {time.perf_counter() - start:.3f}s.")
+                if dry_run:
+                    return await self._dry_run(session, baseline=baseline)
+                pending = await self.plan(session, baseline=baseline)
+                if not pending:
+                    self.logger.info("No migrations to apply.")
+                    return pending
+                self.logger.warning(f"Applying {len(pending)} migrations...")
+                for file in pending:
+                    await self._apply(session, file)
+            finally:
+                try:
+                    await session.execute("SELECT pg_advisory_unlock($1)", LOCK_KEY)
+                except Exception as e:
+                    # the pool resets the connection on release, which drops its advisory locks, keep the original error
+                    self.logger.error(f"Failed to release the migration lock: {e}")
+        self.logger.flair(f"Finished applying migrations in {time.perf_counter() - start:.3f}s.")
+        return pending
+
+    async def _dry_run(self, session: "Session", *, baseline: bool) -> list[MigrationFile]:
+        pending: list[MigrationFile] = []
+        try:
+            async with self.db.transaction(session):
+                pending = await self.plan(session, baseline=baseline)
+                raise _DryRun()
+        except _DryRun:
+            pass
+        for file in pending:
+            self.logger.warning(f"[dry run] Would apply migration {file.path.name} ({file.checksum[:12]}).")
+        if not pending:
+            self.logger.info("[dry run] No migrations to apply.")
+        return pending
+
+    async def _apply(self, session: "Session", file: MigrationFile) -> None:
+        assert file.id is not None
+        self.logger.info(f"Applying migration {file.id}...")
+        start = time.perf_counter()
+        try:
+            async with self.db.transaction(session):
+                await session.execute(file.sql)
+                await self.db.migrations.create(
+                    Migration(
+                        file.id,
+                        file.timestamp,
+                        file.checksum,
+                        datetime.datetime.now(),
+                        time.perf_counter() - start,
+                        False,
+                    ),
+                    session=session,
+                )
+        except Exception:
+            self.logger.critical(f"Failed to apply migration {file.id}! Rolled back.")
+            raise
+        self.logger.info(f"Applied migration {file.id} in {time.perf_counter() - start:.3f}s.")
@@ -1,22 +1,113 @@
 import datetime
+import typing as t
 import uuid
 
 import attrs
 
+from .schema import column, json_column
+
 __all__: tuple[str, ...] = (
     "Record",
     "Config",
+    "Migration",
+    "GuildConfig",
+    "TicketSettings",
+    "Ticket",
+    "Activity",
+    "Timer",
 )
 
 
 class Record:
     """A record in the database."""
 
+    # keeps the attrs models below fully slotted, a __dict__ per decoded row adds up on bulk fetches
+    __slots__ = ()
+
 
-@attrs.define(frozen=True)
+@attrs.define(frozen=True, slots=True)
 class Config(Record):
     """A record in the config table."""
 
-    bot_id: int
-    migrations: list["uuid.UUID"]
-    last_login: datetime.datetime
+    bot_id: int = column("BIGINT", primary_key=True)
+    migrations: list["uuid.UUID"] = column("UUID []")
+    last_login: datetime.datetime = column("TIMESTAMP")
+    # payload hashes of the application commands per sync scope, as of the last sync
+    commands: dict[str, t.Any] = json_column(nullable=False, sql_default="'{}'", factory=dict)
+
+
+@attrs.define(frozen=True, slots=True)
+class Migration(Record):
+    """A record in the migrations ledger."""
+
+    id: uuid.UUID = column("UUID", primary_key=True)
+    timestamp: float = column("DOUBLE PRECISION", nullable=False)
+    checksum: str = column("TEXT", nullable=False)
+    applied_at: datetime.datetime = column("TIMESTAMP", nullable=False)
+    duration: float = column("DOUBLE PRECISION", nullable=False, sql_default="0")
+    baseline: bool = column("BOOLEAN", nullable=False, sql_default="FALSE")
+
+
+@attrs.define(frozen=True, slots=True)
+class TicketSettings:
+    """Ticket behaviour of a guild, stored as a JSONB document in guild_config."""
+
+    max_open_per_user: int = 1
+    transcripts: bool = True
+    auto_close_after: float | None = None
+
+
+@attrs.define(frozen=True, slots=True)
+class GuildConfig(Record):
+    """A record in the guild_config table, guilds without one use the defaults."""
+
+    guild_id: int = column("BIGINT", primary_key=True)
+    locale: str = column("TEXT", nullable=False, sql_default="'en-US'", default="en-US")
+    log_channel_id: int | None = column("BIGINT", default=None)
+    ticket_category_id: int | None = column("BIGINT", default=None)
+    support_role_id: int | None = column("BIGINT", default=None)
+    updated_at: datetime.datetime | None = column("TIMESTAMP", default=None)
+    tickets: TicketSettings = json_column(TicketSettings, nullable=False, sql_default="'{}'", factory=TicketSettings)
+
+
+@attrs.define(frozen=True, slots=True)
+class Ticket(Record):
+    """A record in the tickets table, keyed by the ticket's channel id and open while ``closed_at`` is unset."""
+
+    id: int = column("BIGINT", primary_key=True)
+    guild_id: int = column("BIGINT", nullable=False)
+    user_id: int = column("BIGINT", nullable=False)
+    opened_at: datetime.datetime = column("TIMESTAMP", nullable=False)
+    subject: str | None = column("TEXT", default=None)
+    closed_at: datetime.datetime | None = column("TIMESTAMP", default=None)
+    closed_by: int | None = column("BIGINT", default=None)
+
+    @property
+    def is_open(self) -> bool:
+        return self.closed_at is None
+
+
+@attrs.define(frozen=True, slots=True)
+class Activity(Record):
+    """A record in the activity table, the messages of one user in one channel during one minute."""
+
+    guild_id: int = column("BIGINT", primary_key=True)
+    channel_id: int = column("BIGINT", primary_key=True)
+    user_id: int = column("BIGINT", primary_key=True)
+    # start of the minute, in UTC
+    minute: datetime.datetime = column("TIMESTAMP", primary_key=True)
+    messages: int = column("INTEGER", nullable=False, sql_default="0", accumulate=True, default=0)
+    characters: int = column("INTEGER", nullable=False, sql_default="0", accumulate=True, default=0)
+
+
+@attrs.define(frozen=True, slots=True)
+class Timer(Record):
+    """A record in the timers table, dispatched as ``timer_complete`` once ``expires_at`` passes."""
+
+    id: uuid.UUID = column("UUID", primary_key=True)
+    event: str = column("TEXT", nullable=False)
+    expires_at: datetime.datetime = column("TIMESTAMP", nullable=False)
+    created_at: datetime.datetime = column("TIMESTAMP", nullable=False)
+    extra: dict[str, t.Any] = json_column(nullable=False, sql_default="'{}'", factory=dict)
+    # the guild the timer belongs to, it is dispatched by the process running the guild's shard
+    guild_id: int | None = column("BIGINT", default=None)
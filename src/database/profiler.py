@@ -0,0 +1,121 @@
+import functools
+import re
+import time
+import typing as t
+
+import attrs
+
+from .metrics import Histogram
+
+__all__: tuple[str, ...] = (
+    "QueryProfiler",
+    "QueryStats",
+    "normalize",
+)
+
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+_ROW_STATUS = re.compile(r"(\d+)$")
+EXPLAINABLE: tuple[str, ...] = ("select", "with", "insert", "update", "delete")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize(query: str) -> str:
+    """Replace literals with ``?`` and collapse whitespace, so queries differing only in values share stats."""
+    query = _STRINGS.sub("?", query)
+    query = _NUMBERS.sub("?", query)
+    return _SPACES.sub(" ", query).strip()
+
+
+def row_count(method: str, args: tuple[t.Any, ...], result: t.Any) -> int:
+    """Rows returned or affected by a driver call, from the result or the command status tag."""
+    if method == "fetch":
+        # None when the call failed, the error it raised has to come through
+        return len(result) if result is not None else 0
+    if method in ("fetchrow", "fetchval"):
+        return int(result is not None)
+    if method == "executemany":
+        return len(args[0]) if args and hasattr(args[0], "__len__") else 0
+    if isinstance(result, str) and (match := _ROW_STATUS.search(result)):
+        return int(match.group(1))
+    return 0
+
+
+@attrs.define(slots=True, eq=False)
+class QueryStats:
+    """Latency, row and slow call counters of one normalized statement."""
+
+    query: str
+    name: str | None = None
+    latency: Histogram = attrs.field(factory=Histogram)
+    rows: int = 0
+    slow: int = 0
+    plan: str | None = None
+    explained_at: float = 0.0
+
+    @property
+    def label(self) -> str:
+        return self.name or self.query
+
+    @property
+    def calls(self) -> int:
+        return self.latency.count
+
+    @property
+    def total_time(self) -> float:
+        return self.latency.total
+
+
+class QueryProfiler:
+    """Per statement latency histograms and row counts, fed by every query ``Database`` runs.
+
+    Calls over ``threshold`` seconds are counted as slow, ``explain`` enables capturing their plans
+    at most once per ``explain_interval`` seconds per statement.
+    """
+
+    def __init__(self, *, threshold: float, explain: bool = False, explain_interval: float = 300.0) -> None:
+        self.threshold = threshold
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self._stats: dict[str, QueryStats] = {}
+
+    def __iter__(self) -> t.Iterator[QueryStats]:
+        return iter(self._stats.values())
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def record(self, query: str, elapsed: float, rows: int, *, name: str | None = None) -> QueryStats:
+        key = normalize(query)
+        if (stats := self._stats.get(key)) is None:
+            stats = self._stats[key] = QueryStats(key, name)
+        stats.latency.observe(elapsed)
+        stats.rows += rows
+        if elapsed >= self.threshold:
+            stats.slow += 1
+        return stats
+
+    def should_explain(self, stats: QueryStats, query: str) -> bool:
+        if not self.explain or not query.lstrip()[:6].lower().startswith(EXPLAINABLE):
+            return False
+        now = time.monotonic()
+        if stats.explained_at and now - stats.explained_at < self.explain_interval:
+            return False
+        stats.explained_at = now
+        return True
+
+    def top(self, count: int = 10, *, by: str = "total") -> list[QueryStats]:
+        """The ``count`` worst statements by ``total`` time, ``p95``/``p99`` latency, ``calls`` or ``slow`` calls."""
+        keys: dict[str, t.Callable[[QueryStats], float]] = {
+            "total": lambda s: s.total_time,
+            "p95": lambda s: s.latency.percentile(0.95),
+            "p99": lambda s: s.latency.percentile(0.99),
+            "calls": lambda s: s.calls,
+            "slow": lambda s: s.slow,
+        }
+        return sorted(self._stats.values(), key=keys[by], reverse=True)[:count]
+
+    def reset(self) -> None:
+        self._stats.clear()
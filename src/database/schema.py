@@ -0,0 +1,220 @@
+import functools
+import typing as t
+
+import attrs
+
+from .codecs import structure, unstructure
+
+__all__: tuple[str, ...] = (
+    "Column",
+    "Index",
+    "Schema",
+    "column",
+    "json_column",
+)
+
+
+COLUMN = "__column__"
+
+
+@attrs.define(frozen=True, slots=True)
+class Column:
+    """Column definition attached to an attrs field through :func:`column`."""
+
+    type: str
+    primary_key: bool = False
+    nullable: bool = True
+    default: str | None = None
+    name: str = ""
+    # upserts add the incoming value to the stored one instead of replacing it, e.g. for counters
+    accumulate: bool = False
+    # applied to the attribute before it is sent and to the value read back, e.g. for structured JSON fields
+    encode: t.Callable[[t.Any], t.Any] | None = attrs.field(default=None, eq=False)
+    decode: t.Callable[[t.Any], t.Any] | None = attrs.field(default=None, eq=False)
+
+    @property
+    def ddl(self) -> str:
+        ddl = f"{self.name} {self.type}"
+        if not self.nullable or self.primary_key:
+            ddl += " NOT NULL"
+        if self.default is not None:
+            ddl += f" DEFAULT {self.default}"
+        return ddl
+
+
+@attrs.define(frozen=True, slots=True)
+class Index:
+    """A secondary index, ``where`` turns it into a partial index."""
+
+    columns: tuple[str, ...]
+    unique: bool = False
+    where: str | None = None
+    name: str | None = None
+
+    def ddl(self, table: str) -> str:
+        name = self.name or f"{table}_{'_'.join(self.columns)}_idx"
+        unique = "UNIQUE " if self.unique else ""
+        where = f" WHERE {self.where}" if self.where else ""
+        return f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(self.columns)}){where}"
+
+
+def column(
+    type: str,
+    *,
+    primary_key: bool = False,
+    nullable: bool = True,
+    sql_default: str | None = None,
+    accumulate: bool = False,
+    **kwargs: t.Any,
+) -> t.Any:
+    """An attrs field that maps to a table column of the given SQL ``type``.
+
+    ``accumulate`` makes upserts add to the stored value rather than overwrite it.
+    """
+    metadata = {
+        COLUMN: Column(type, primary_key=primary_key, nullable=nullable, default=sql_default, accumulate=accumulate)
+    }
+    return attrs.field(metadata=metadata | kwargs.pop("metadata", {}), **kwargs)
+
+
+def json_column(
+    model: type[t.Any] | None = None,
+    *,
+    nullable: bool = True,
+    sql_default: str | None = None,
+    **kwargs: t.Any,
+) -> t.Any:
+    """An attrs field stored as JSONB, ``model`` (an attrs class) is saved as its dict and rebuilt on load.
+
+    Without ``model`` the field holds plain JSON values (dicts, lists, numbers, strings).
+    """
+    definition = Column(
+        "JSONB",
+        nullable=nullable,
+        default=sql_default,
+        encode=unstructure if model is not None else None,
+        decode=functools.partial(structure, model) if model is not None else None,
+    )
+    return attrs.field(metadata={COLUMN: definition} | kwargs.pop("metadata", {}), **kwargs)
+
+
+def _compile(name: str, body: str, namespace: dict[str, t.Any]) -> t.Callable[..., t.Any]:
+    exec(compile(f"def {name}(r):\n    return {body}", f"<schema {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _attributes(names: t.Sequence[str], encoded: t.Collection[str] = ()) -> str:
+    return "(" + "".join(f"_{name}(r.{name}), " if f"_{name}" in encoded else f"r.{name}, " for name in names) + ")"
+
+
+@attrs.define(frozen=True, slots=True, kw_only=True)
+class Schema:
+    """Everything a :class:`~src.database.tables.Table` needs, generated once from an attrs model.
+
+    Queries always name their columns in the model's field order, so ``decode`` can build records
+    positionally from a row without caring how the columns are ordered in the actual table.
+    """
+
+    table: str
+    model: type[t.Any]
+    columns: tuple[Column, ...]
+    primary_key: tuple[str, ...]
+    indexes: tuple[Index, ...]
+    create: str
+    select: str
+    get: str
+    get_many: str | None
+    get_all: str
+    page_first: str
+    page_after: str
+    insert: str
+    upsert: str
+    staging: str
+    create_staging: str
+    merge_missing: str
+    merge_upsert: str
+    # None when every column is part of the primary key, there is nothing to update then
+    update: str | None
+    delete: str
+    decode: t.Callable[[t.Any], t.Any]
+    encode: t.Callable[[t.Any], tuple[t.Any, ...]]
+    encode_update: t.Callable[[t.Any], tuple[t.Any, ...]]
+    key: t.Callable[[t.Any], t.Any]
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(c.name for c in self.columns)
+
+    def key_args(self, key: t.Any) -> tuple[t.Any, ...]:
+        return tuple(key) if len(self.primary_key) > 1 else (key,)
+
+    @classmethod
+    def build(cls, table: str, model: type[t.Any], indexes: t.Iterable[Index] = ()) -> "Schema":
+        columns: list[Column] = []
+        for field in attrs.fields(model):
+            if (definition := field.metadata.get(COLUMN)) is None:
+                raise TypeError(f"{model.__name__}.{field.name} is not declared with column().")
+            columns.append(attrs.evolve(definition, name=field.name))
+        names = [c.name for c in columns]
+        encoders = {f"_{c.name}": c.encode for c in columns if c.encode is not None}
+        decoders = {f"_{c.name}": c.decode for c in columns if c.decode is not None}
+        primary_key = tuple(c.name for c in columns if c.primary_key)
+        if not primary_key:
+            raise TypeError(f"{model.__name__} does not declare a primary key column.")
+        values = [name for name in names if name not in primary_key]
+        accumulate = {c.name for c in columns if c.accumulate}
+        where = " AND ".join(f"{name} = ${i}" for i, name in enumerate(primary_key, 1))
+        select = f"SELECT {', '.join(names)} FROM {table}"
+        order = f"ORDER BY {', '.join(primary_key)}"
+        after = f"({', '.join(primary_key)}) > ({', '.join(f'${i}' for i in range(1, len(primary_key) + 1))})"
+        staging = f"_{table}_staging"
+        merge = f"INSERT INTO {table} ({', '.join(names)}) SELECT {', '.join(names)} FROM {staging}"
+        conflict = f"ON CONFLICT ({', '.join(primary_key)}) DO"
+        insert = (
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join(f'${i}' for i in range(1, len(names) + 1))})"
+        )
+        upsert = f"{conflict} UPDATE SET " + ", ".join(
+            f"{name} = {table}.{name} + EXCLUDED.{name}" if name in accumulate else f"{name} = EXCLUDED.{name}"
+            for name in values
+        )
+        return cls(
+            table=table,
+            model=model,
+            columns=tuple(columns),
+            primary_key=primary_key,
+            indexes=tuple(indexes),
+            create=(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                f"({', '.join(c.ddl for c in columns)}, PRIMARY KEY ({', '.join(primary_key)}))"
+            ),
+            select=select,
+            get=f"{select} WHERE {where}",
+            get_many=f"{select} WHERE {primary_key[0]} = ANY($1)" if len(primary_key) == 1 else None,
+            get_all=select,
+            page_first=f"{select} {order} LIMIT $1",
+            page_after=f"{select} WHERE {after} {order} LIMIT ${len(primary_key) + 1}",
+            insert=insert,
+            upsert=f"{insert} {upsert if values else f'{conflict} NOTHING'}",
+            staging=staging,
+            create_staging=f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP",
+            merge_missing=f"WITH merged AS ({merge} {conflict} NOTHING RETURNING 1) SELECT count(*) FROM merged",
+            merge_upsert=(
+                f"WITH merged AS ({merge} {upsert if values else f'{conflict} NOTHING'} RETURNING 1) "
+                "SELECT count(*) FROM merged"
+            ),
+            update=(
+                f"UPDATE {table} SET {', '.join(f'{name} = ${i}' for i, name in enumerate(values, 1))} "
+                f"WHERE {' AND '.join(f'{name} = ${i}' for i, name in enumerate(primary_key, len(values) + 1))}"
+                if values
+                else None
+            ),
+            delete=f"DELETE FROM {table} WHERE {where}",
+            decode=_compile(
+                "decode",
+                f"model({', '.join(f'_{c.name}(r[{i}])' if c.decode else f'r[{i}]' for i, c in enumerate(columns))})",
+                {"model": model, **decoders},
+            ),
+            encode=_compile("encode", _attributes(names, encoders), dict(encoders)),
+            encode_update=_compile("encode_update", _attributes(values + list(primary_key), encoders), dict(encoders)),
+            key=_compile("key", f"r.{primary_key[0]}" if len(primary_key) == 1 else _attributes(primary_key), {}),
+        )
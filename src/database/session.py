@@ -0,0 +1,95 @@
+import contextlib
+import typing as t
+
+import asyncpg
+
+if t.TYPE_CHECKING:
+    from . import Database, Query
+
+
+__all__: tuple[str, ...] = ("Session",)
+# pyright: reportMissingTypeArgument=false
+
+
+class Session:
+    """A single pooled connection pinned across several queries.
+
+    Sessions expose the same query helpers as :class:`Database`. Transactions opened on a session nest,
+    inner ones become savepoints, and callbacks registered with :meth:`on_commit` only run once the
+    outermost transaction commits, those registered with :meth:`on_rollback` when theirs rolls back.
+    """
+
+    def __init__(self, database: "Database", connection: asyncpg.Connection) -> None:
+        self.db = database
+        self.connection = connection
+        self._pending: list[list[t.Callable[[], t.Any]]] = []
+        self._rollback: list[list[t.Callable[[], t.Any]]] = []
+
+    @property
+    def in_transaction(self) -> bool:
+        return bool(self._pending)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self, **kwargs: t.Any) -> t.AsyncIterator["Session"]:
+        self._pending.append([])
+        self._rollback.append([])
+        try:
+            async with self.connection.transaction(**kwargs):
+                yield self
+        except BaseException:
+            self._pending.pop()
+            for callback in reversed(self._rollback.pop()):
+                callback()
+            raise
+        callbacks = self._pending.pop()
+        undo = self._rollback.pop()
+        if self._pending:
+            # a committed savepoint is still undone when an outer transaction rolls back
+            self._pending[-1].extend(callbacks)
+            self._rollback[-1].extend(undo)
+        else:
+            for callback in callbacks:
+                callback()
+
+    def on_commit(self, callback: t.Callable[[], t.Any]) -> None:
+        """Run ``callback`` once the current transaction commits, or right away outside of one."""
+        if self._pending:
+            self._pending[-1].append(callback)
+        else:
+            callback()
+
+    def on_rollback(self, callback: t.Callable[[], t.Any]) -> None:
+        """Run ``callback`` if the current transaction rolls back, outside of one it is never called."""
+        if self._rollback:
+            self._rollback[-1].append(callback)
+
+    async def cursor(self, query: "Query", *args: t.Any, prefetch: int | None = None) -> t.AsyncIterator[t.Any]:
+        """Stream rows through a server side cursor, only possible inside a transaction."""
+        if not self.in_transaction:
+            raise RuntimeError("Cursors can only be used inside a transaction.")
+        text = query if isinstance(query, str) else query.query
+        async for row in self.connection.cursor(text, *args, prefetch=prefetch):
+            yield row
+
+    async def copy_records(
+        self, table: str, records: t.Iterable[tuple[t.Any, ...]], *, columns: t.Sequence[str]
+    ) -> None:
+        """Bulk load ``records`` into ``table`` with the binary COPY protocol."""
+        await self.db._run(
+            self.connection, "copy_records_to_table", table, records=records, columns=list(columns), guarded=False
+        )
+
+    async def execute(self, query: "Query", *args: t.Any) -> None:
+        await self.db._run(self.connection, "execute", query, *args, guarded=False)
+
+    async def fetch(self, query: "Query", *args: t.Any) -> t.Any:
+        return await self.db._run(self.connection, "fetch", query, *args, guarded=False)
+
+    async def fetchrow(self, query: "Query", *args: t.Any) -> t.Any:
+        return await self.db._run(self.connection, "fetchrow", query, *args, guarded=False)
+
+    async def execute_many(self, query: "Query", *args: t.Any) -> None:
+        await self.db._run(self.connection, "executemany", query, *args, guarded=False)
+
+    async def fetchval(self, query: "Query", *args: t.Any) -> t.Any:
+        return await self.db._run(self.connection, "fetchval", query, *args, guarded=False)
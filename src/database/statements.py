@@ -0,0 +1,51 @@
+import typing as t
+
+import attrs
+
+__all__: tuple[str, ...] = (
+    "Statement",
+    "StatementRegistry",
+)
+
+
+@attrs.define(slots=True, eq=False)
+class Statement:
+    """A named query, prepared once per pooled connection by asyncpg's statement cache."""
+
+    name: str
+    query: str
+    calls: int = 0
+    total_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total_time += elapsed
+
+
+class StatementRegistry:
+    def __init__(self) -> None:
+        self._statements: dict[str, Statement] = {}
+
+    def __getitem__(self, name: str) -> Statement:
+        return self._statements[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._statements
+
+    def __iter__(self) -> t.Iterator[Statement]:
+        return iter(self._statements.values())
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def register(self, name: str, query: str) -> Statement:
+        if (existing := self._statements.get(name)) is not None:
+            if existing.query != query:
+                raise ValueError(f"Statement {name!r} is already registered with a different query.")
+            return existing
+        statement = self._statements[name] = Statement(name, query)
+        return statement
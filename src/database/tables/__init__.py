@@ -1,7 +1,17 @@
 from ._table import Table
+from .activity import Activity
 from .config import Config
+from .guild_config import GuildConfig
+from .migrations import Migrations
+from .tickets import Tickets
+from .timers import Timers
 
 __all__: tuple[str, ...] = (
     "Table",
+    "Activity",
     "Config",
+    "GuildConfig",
+    "Migrations",
+    "Tickets",
+    "Timers",
 )
@@ -1,9 +1,17 @@
 import abc
+import functools
 import typing
 
+from src.core.errors import DatabaseUnavailable
+
+from ..cache import CacheStats, LRUCache
+from ..loader import BatchLoader
+from ..schema import Index, Schema
+
 if typing.TYPE_CHECKING:
-    from .. import Database
+    from .. import Database, Session
     from ..models import Record
+    from ..statements import Statement
 
 
 __all__: tuple[str, ...] = ("Table",)
@@ -13,29 +21,245 @@ T = typing.TypeVar("T", bound="Record")
 
 
 class Table(abc.ABC, typing.Generic[T]):
+    """Base class of every table.
+
+    Passing ``model`` to the class definition declares the table from the attrs model's ``column()`` fields,
+    the DDL, queries and record decoder are then generated once for the class and the CRUD methods below
+    work without being overridden. ``depends_on`` lists the tables whose setup has to finish first.
+
+    ``cache_size`` keeps up to that many records in an LRU cache keyed by primary key, expired ``cache_ttl``
+    seconds after they were stored. Use ``cache_get``/``cache_set``/``cache_invalidate`` in table methods,
+    ``cache_stats`` counts hits and misses.
+    """
+
+    schema: typing.ClassVar[Schema]
+    depends_on: typing.ClassVar[tuple[str, ...]] = ()
+    cache_size: int = 0
+    cache_ttl: float | None = None
+    _get: "Statement"
+    _get_many: "Statement"
+    _get_all: "Statement"
+    _create: "Statement"
+    _update: "Statement"
+    _delete: "Statement"
+    _page_first: "Statement"
+    _page_after: "Statement"
+
+    def __init_subclass__(
+        cls,
+        model: type["Record"] | None = None,
+        name: str | None = None,
+        indexes: typing.Iterable[Index] = (),
+        depends_on: typing.Iterable["type[Table[typing.Any]] | str"] = (),
+        cache_size: int = 0,
+        cache_ttl: float | None = None,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init_subclass__(**kwargs)
+        if model is not None:
+            cls.schema = Schema.build(name or cls.__name__.lower(), model, indexes)
+        elif getattr(cls, "schema", None) is None:
+            raise TypeError(
+                f"{cls.__name__} has to be declared from a model, e.g. class {cls.__name__}(Table[M], model=M)."
+            )
+        # tables are set up once everything they depend on (e.g. foreign key targets) is, referenced by class name
+        cls.depends_on = tuple(d if isinstance(d, str) else d.__name__ for d in depends_on)
+        cls.cache_size = cache_size
+        cls.cache_ttl = cache_ttl
+
     def __init__(self, database: "Database") -> None:
         self.db = database
+        self.cache: LRUCache[typing.Any, T] | None = (
+            LRUCache(self.cache_size, self.cache_ttl) if self.cache_size else None
+        )
+        # concurrent gets outside of a session are batched into one = ANY query, single column keys only
+        self.loader: BatchLoader[typing.Any, T] | None = BatchLoader(self._load_many) if self.schema.get_many else None
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        return self.cache.stats if self.cache is not None else None
+
+    def cache_get(self, key: typing.Any) -> T | None:
+        return self.cache.get(key) if self.cache is not None else None
+
+    def cache_peek(self, key: typing.Any) -> T | None:
+        return self.cache.peek(key) if self.cache is not None else None
+
+    def cache_stale(self, key: typing.Any) -> T | None:
+        return self.cache.stale(key) if self.cache is not None else None
+
+    def cache_set(self, key: typing.Any, record: T, *, session: "Session | None" = None) -> None:
+        """Write ``record`` through to the cache, inside a transaction only once it commits."""
+        if self.cache is None:
+            return
+        if session is not None and session.in_transaction:
+            self.cache.invalidate(key)
+            session.on_commit(functools.partial(self.cache.set, key, record))
+        else:
+            self.cache.set(key, record)
+
+    def cache_invalidate(self, key: typing.Any, *, session: "Session | None" = None) -> None:
+        if self.cache is None:
+            return
+        self.cache.invalidate(key)
+        if session is not None and session.in_transaction:
+            session.on_commit(functools.partial(self.cache.invalidate, key))
+
+    def executor(self, session: "Session | None" = None) -> "Session | Database":
+        """The session to run a query on when one was passed in, otherwise the pooled database."""
+        return session if session is not None else self.db
 
-    @abc.abstractmethod
     async def setup(self) -> None:
-        ...
+        schema = self.schema
+        # one round trip for the whole DDL, it runs as a single implicit transaction. Columns added to the model
+        # later are added to existing tables by the migration runner.
+        ddl = [schema.create, *(index.ddl(schema.table) for index in schema.indexes)]
+        await self.db.execute(";\n".join(ddl))
+        self._get = self.db.prepare(f"{schema.table}.get", schema.get)
+        if schema.get_many:
+            self._get_many = self.db.prepare(f"{schema.table}.get_many", schema.get_many)
+        self._get_all = self.db.prepare(f"{schema.table}.get_all", schema.get_all)
+        self._create = self.db.prepare(f"{schema.table}.create", schema.insert)
+        if schema.update:
+            self._update = self.db.prepare(f"{schema.table}.update", schema.update)
+        self._delete = self.db.prepare(f"{schema.table}.delete", schema.delete)
+        self._page_first = self.db.prepare(f"{schema.table}.page_first", schema.page_first)
+        self._page_after = self.db.prepare(f"{schema.table}.page_after", schema.page_after)
+
+    async def teardown(self) -> None:
+        """Called when the database closes, before the pool does, e.g. to flush buffered writes."""
+
+    async def get_all(self, *, session: "Session | None" = None) -> list[T]:
+        decode = self.schema.decode
+        return [decode(row) for row in await self.executor(session).fetch(self._get_all)]
+
+    async def iter_all(
+        self,
+        *,
+        prefetch: int = 500,
+        keyset: bool = False,
+        after: typing.Any = None,
+        session: "Session | None" = None,
+    ) -> typing.AsyncIterator[T]:
+        """Stream every record in constant memory, ``prefetch`` rows at a time.
+
+        By default rows come from a server side cursor, which keeps one connection and transaction open
+        until the iteration ends. ``keyset`` instead pages through the primary key with short independent
+        queries, starting after the key ``after`` when given, which suits long running backfills.
+        """
+        schema = self.schema
+        decode = schema.decode
+        if not keyset:
+            async with self.db.transaction(session) as transaction:
+                async for row in transaction.cursor(self._get_all, prefetch=prefetch):
+                    yield decode(row)
+            return
+        executor = self.executor(session)
+        while True:
+            if after is None:
+                rows = await executor.fetch(self._page_first, prefetch)
+            else:
+                rows = await executor.fetch(self._page_after, *schema.key_args(after), prefetch)
+            for row in rows:
+                yield decode(row)
+            if len(rows) < prefetch:
+                return
+            after = schema.key(decode(rows[-1]))
+
+    async def get(self, id: typing.Any, *, session: "Session | None" = None) -> T | None:
+        if (cached := self.cache_get(id)) is not None:
+            return cached
+        if session is None and self.loader is not None:
+            return await self.loader.load(id)
+        schema = self.schema
+        row = await self.executor(session).fetchrow(self._get, *schema.key_args(id))
+        if row is None:
+            return None
+        record: T = schema.decode(row)
+        self.cache_set(id, record, session=session)
+        return record
+
+    async def get_or_stale(self, id: typing.Any, *, session: "Session | None" = None) -> tuple[T | None, bool]:
+        """:meth:`get` falling back to the last cached record while the database is unavailable.
+
+        The flag tells whether the record is such a stale copy.
+        """
+        try:
+            return await self.get(id, session=session), False
+        except DatabaseUnavailable:
+            if (record := self.cache_stale(id)) is None:
+                raise
+            return record, True
+
+    async def get_many(
+        self, ids: typing.Iterable[typing.Any], *, session: "Session | None" = None
+    ) -> dict[typing.Any, T]:
+        """The records of ``ids`` that exist by key, cached ones are not fetched again."""
+        found: dict[typing.Any, T] = {}
+        missing = []
+        for id in dict.fromkeys(ids):
+            if (cached := self.cache_get(id)) is not None:
+                found[id] = cached
+            else:
+                missing.append(id)
+        if missing:
+            found.update(await self._load_many(missing, session=session))
+        return found
+
+    async def _load_many(self, ids: list[typing.Any], *, session: "Session | None" = None) -> dict[typing.Any, T]:
+        schema = self.schema
+        executor = self.executor(session)
+        if schema.get_many:
+            rows = await executor.fetch(self._get_many, ids)
+        else:
+            rows = [row for id in ids if (row := await executor.fetchrow(self._get, *schema.key_args(id))) is not None]
+        records: dict[typing.Any, T] = {}
+        for row in rows:
+            record: T = schema.decode(row)
+            records[key := schema.key(record)] = record
+            self.cache_set(key, record, session=session)
+        return records
+
+    async def create(self, record: T, *, session: "Session | None" = None) -> None:
+        schema = self.schema
+        await self.executor(session).execute(self._create, *schema.encode(record))
+        self.cache_set(schema.key(record), record, session=session)
+
+    async def _merge(self, records: typing.Iterable[T], merge: str, session: "Session | None") -> int:
+        schema = self.schema
+        # keep the last record per key, a single INSERT ... ON CONFLICT cannot touch the same row twice
+        rows = {schema.key(record): schema.encode(record) for record in records}
+        if not rows:
+            return 0
+        async with self.db.transaction(session) as transaction:
+            await transaction.execute(schema.create_staging)
+            await transaction.copy_records(schema.staging, rows.values(), columns=schema.names)
+            merged: int = await transaction.fetchval(merge)
+            await transaction.execute(f"DROP TABLE {schema.staging}")
+        for key in rows:
+            self.cache_invalidate(key, session=session)
+        return merged
 
-    @abc.abstractmethod
-    async def get_all(self) -> list[T]:
-        ...
+    async def create_many(self, records: typing.Iterable[T], *, session: "Session | None" = None) -> int:
+        """Bulk insert through COPY into a staging table, records whose key already exists are skipped.
 
-    @abc.abstractmethod
-    async def get(self, id: int) -> T:
-        ...
+        Returns the number of inserted rows.
+        """
+        return await self._merge(records, self.schema.merge_missing, session)
 
-    @abc.abstractmethod
-    async def create(self, record: T) -> None:
-        ...
+    async def upsert_many(self, records: typing.Iterable[T], *, session: "Session | None" = None) -> int:
+        """Bulk insert or update through COPY into a staging table. Returns the number of written rows."""
+        return await self._merge(records, self.schema.merge_upsert, session)
 
-    @abc.abstractmethod
-    async def update(self, record: T) -> None:
-        ...
+    async def update(self, record: T, *, session: "Session | None" = None) -> None:
+        schema = self.schema
+        if schema.update is None:
+            raise TypeError(f"{type(self).__name__} has no columns besides its primary key to update.")
+        await self.executor(session).execute(self._update, *schema.encode_update(record))
+        self.cache_set(schema.key(record), record, session=session)
 
-    @abc.abstractmethod
-    async def delete(self, record: T) -> None:
-        ...
+    async def delete(self, record: T, *, session: "Session | None" = None) -> None:
+        schema = self.schema
+        key = schema.key(record)
+        await self.executor(session).execute(self._delete, *schema.key_args(key))
+        self.cache_invalidate(key, session=session)
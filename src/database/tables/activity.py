@@ -0,0 +1,157 @@
+import asyncio
+import datetime
+import time
+import typing as t
+
+import attrs
+
+from src.database.models import Activity as ActivityModel
+from src.database.schema import Index
+
+from ._table import Table
+
+if t.TYPE_CHECKING:
+    from src.database import Database, Session
+    from src.database.statements import Statement
+
+
+__all__: tuple[str, ...] = (
+    "Activity",
+    "ActivityStats",
+)
+
+
+@attrs.define(slots=True)
+class ActivityStats:
+    """Counters describing the messages buffered and written by :class:`Activity`."""
+
+    recorded: int = 0
+    dropped: int = 0
+    written: int = 0
+    failed: int = 0
+    flushes: int = 0
+    flush_time: float = 0.0
+
+
+def _minute(minute: int) -> datetime.datetime:
+    # the column is a TIMESTAMP holding UTC, asyncpg only takes naive datetimes for it
+    return datetime.datetime.fromtimestamp(minute * 60, tz=datetime.timezone.utc).replace(tzinfo=None)
+
+
+class Activity(Table[ActivityModel], model=ActivityModel, name="activity", indexes=(Index(("guild_id", "minute")),)):
+    """Message counts per guild, channel, user and minute.
+
+    :meth:`record` only adds the message to an in-memory bucket. The buckets are merged into the table with
+    one COPY and an accumulating upsert every ``ACTIVITY_FLUSH_INTERVAL`` seconds, once half of the buffer
+    is in use and when the database closes. While ``ACTIVITY_MAX_BUCKETS`` buckets are pending, messages
+    that would open a new one are dropped and counted in ``stats.dropped``.
+    """
+
+    _top_users: "Statement"
+    _top_channels: "Statement"
+
+    def __init__(self, database: "Database") -> None:
+        super().__init__(database)
+        self.interval = database.bot.config.ACTIVITY_FLUSH_INTERVAL
+        self.max_buckets = database.bot.config.ACTIVITY_MAX_BUCKETS
+        self.stats = ActivityStats()
+        # (guild id, channel id, user id, minutes since the epoch) -> [messages, characters]
+        self._buckets: dict[tuple[int, int, int, int], list[int]] = {}
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def setup(self) -> None:
+        await super().setup()
+        totals = "sum(messages) AS total FROM activity WHERE guild_id = $1 AND minute >= $2"
+        self._top_users = self.db.prepare(
+            "activity.top_users", f"SELECT user_id, {totals} GROUP BY user_id ORDER BY total DESC LIMIT $3"
+        )
+        self._top_channels = self.db.prepare(
+            "activity.top_channels", f"SELECT channel_id, {totals} GROUP BY channel_id ORDER BY total DESC LIMIT $3"
+        )
+        self._task = asyncio.create_task(self._worker(), name="activity-flush")
+
+    def record(self, guild_id: int, channel_id: int, user_id: int, characters: int = 0) -> None:
+        """Count one message of the user in the channel towards the current minute."""
+        key = (guild_id, channel_id, user_id, int(time.time()) // 60)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self.stats.dropped += 1
+                return
+            bucket = self._buckets[key] = [0, 0]
+            if len(self._buckets) * 2 == self.max_buckets:
+                self._wake.set()
+        bucket[0] += 1
+        bucket[1] += characters
+        self.stats.recorded += 1
+
+    def _requeue(self, buckets: dict[tuple[int, int, int, int], list[int]]) -> None:
+        for key, (messages, characters) in buckets.items():
+            if (bucket := self._buckets.get(key)) is not None:
+                bucket[0] += messages
+                bucket[1] += characters
+            elif len(self._buckets) < self.max_buckets:
+                self._buckets[key] = [messages, characters]
+            else:
+                self.stats.dropped += messages
+
+    async def flush(self) -> int:
+        """Write the pending buckets, returns the number of rows written."""
+        async with self._lock:
+            buckets, self._buckets = self._buckets, {}
+            if not buckets:
+                return 0
+            start = time.perf_counter()
+            records = [
+                ActivityModel(guild, channel, user, _minute(minute), *counts)
+                for (guild, channel, user, minute), counts in buckets.items()
+            ]
+            try:
+                written = await self.upsert_many(records)
+            except Exception as e:
+                # put the counts back for the next flush, as far as the buffer has room for them
+                self._requeue(buckets)
+                self.stats.failed += 1
+                self.db.bot.logger.error(f"Failed to flush {len(buckets)} activity buckets: {e}")
+                return 0
+            self.stats.written += written
+            self.stats.flushes += 1
+            self.stats.flush_time += time.perf_counter() - start
+            return written
+
+    async def _worker(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def teardown(self) -> None:
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def top_users(
+        self, guild_id: int, since: datetime.datetime, *, limit: int = 10, session: "Session | None" = None
+    ) -> list[tuple[int, int]]:
+        """The ``(user id, messages)`` of the guild's most active users since ``since``, in UTC."""
+        rows = await self.executor(session).fetch(self._top_users, guild_id, since, limit)
+        return [(row[0], row[1]) for row in rows]
+
+    async def top_channels(
+        self, guild_id: int, since: datetime.datetime, *, limit: int = 10, session: "Session | None" = None
+    ) -> list[tuple[int, int]]:
+        """The ``(channel id, messages)`` of the guild's busiest channels since ``since``, in UTC."""
+        rows = await self.executor(session).fetch(self._top_channels, guild_id, since, limit)
+        return [(row[0], row[1]) for row in rows]
@@ -1,6 +1,8 @@
 import datetime
 import typing as t
 
+import attrs
+
 from src.database.models import Config as ConfigModel
 
 from ._table import Table
@@ -8,61 +10,64 @@ from ._table import Table
 if t.TYPE_CHECKING:
     import uuid
 
+    from src.database import Session
+    from src.database.statements import Statement
+
 
 __all__: tuple[str, ...] = ("Config",)
 
 
-class Config(Table[ConfigModel]):
+class Config(Table[ConfigModel], model=ConfigModel, name="config", cache_size=16, cache_ttl=300.0):
+    _update_migration: "Statement"
+    _update_login: "Statement"
+    _update_commands: "Statement"
+
     async def setup(self) -> None:
-        await self.db.execute(
-            "CREATE TABLE IF NOT EXISTS config "
-            "(bot_id BIGINT,"
-            " migrations UUID [],"
-            " last_login TIMESTAMP,"
-            " PRIMARY KEY (bot_id))"
+        await super().setup()
+        self._update_migration = self.db.prepare(
+            "config.update_migration", "UPDATE config SET migrations = array_append(migrations, $1) WHERE bot_id = $2"
         )
-
-    async def get(self, id: int) -> ConfigModel:
-        data = await self.db.fetchrow("SELECT * FROM config WHERE bot_id = $1", id)
-        if data is None:
-            config = ConfigModel(id, [], datetime.datetime.now())
-            await self.create(config)
-            return config
-        return ConfigModel(*data)
-
-    async def update(self, record: ConfigModel) -> None:
-        await self.db.execute(
-            "UPDATE config SET migrations = $1, last_login = $2 WHERE bot_id = $3",
-            record.migrations,
-            record.last_login,
-            record.bot_id,
+        self._update_login = self.db.prepare(
+            "config.update_login", "UPDATE config SET last_login = $1 WHERE bot_id = $2"
+        )
+        self._update_commands = self.db.prepare(
+            "config.update_commands", "UPDATE config SET commands = $1 WHERE bot_id = $2"
         )
 
-    async def delete(self, record: ConfigModel) -> None:
-        await self.db.execute("DELETE FROM config WHERE bot_id = $1", record.bot_id)
-
-    async def get_all(self) -> list[ConfigModel]:
-        data = await self.db.fetch("SELECT * FROM config")
-        return [ConfigModel(*record) for record in data]
+    async def get(self, id: int, *, session: "Session | None" = None) -> ConfigModel:
+        if (config := self.cache_get(id)) is not None:
+            return config
+        # pooled reads are guarded, during an outage this raises DatabaseUnavailable for get_or_stale to catch
+        if session is None and (row := await self.db.fetchrow(self._get, id, primary=True)) is not None:
+            config = self.schema.decode(row)
+            self.cache_set(id, config)
+            return config
+        # get or create reads the primary, on a lagging replica an existing row could look missing
+        async with self.db.transaction(session) as transaction:
+            if (row := await transaction.fetchrow(self._get, id)) is not None:
+                config = self.schema.decode(row)
+                self.cache_set(id, config, session=transaction)
+            else:
+                config = ConfigModel(id, [], datetime.datetime.now())
+                await self.create(config, session=transaction)
+        return config
 
-    async def create(self, record: ConfigModel) -> None:
-        await self.db.execute(
-            "INSERT INTO config (bot_id, migrations, last_login) VALUES ($1, $2, $3)",
-            record.bot_id,
-            record.migrations,
-            record.last_login,
-        )
+    async def update_migration(self, bot_id: int, migration: "uuid.UUID", *, session: "Session | None" = None) -> None:
+        await self.executor(session).execute(self._update_migration, migration, bot_id)
+        self.cache_invalidate(bot_id, session=session)
 
-    async def update_migration(self, bot_id: int, migration: "uuid.UUID") -> None:
-        await self.db.execute(
-            "UPDATE config SET migrations = array_append(migrations, $1) WHERE bot_id = $2",
-            migration,
-            bot_id,
-        )
+    async def update_login(self, bot_id: int, *, session: "Session | None" = None) -> None:
+        now = datetime.datetime.now()
+        if session is None:
+            await self.db.defer(self._update_login, now, bot_id, key=bot_id)
+        else:
+            await session.execute(self._update_login, now, bot_id)
+        if (cached := self.cache_peek(bot_id)) is not None:
+            self.cache_set(bot_id, attrs.evolve(cached, last_login=now), session=session)
 
-    async def update_login(self, bot_id: int) -> None:
-        await self.db.execute(
-            "UPDATE config SET last_login = $1 WHERE bot_id = $2",
-            datetime.datetime.now(),
-            bot_id,
-        )
+    async def update_commands(
+        self, bot_id: int, commands: dict[str, t.Any], *, session: "Session | None" = None
+    ) -> None:
+        await self.executor(session).execute(self._update_commands, commands, bot_id)
+        if (cached := self.cache_peek(bot_id)) is not None:
+            self.cache_set(bot_id, attrs.evolve(cached, commands=commands), session=session)
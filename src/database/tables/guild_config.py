@@ -0,0 +1,182 @@
+import asyncio
+import datetime
+import itertools
+import time
+import typing as t
+import uuid
+
+import attrs
+
+from src.database.models import GuildConfig as GuildConfigModel
+
+from ._table import Table
+
+if t.TYPE_CHECKING:
+    from src.database import Database, Session
+    from src.database.statements import Statement
+
+
+__all__: tuple[str, ...] = ("GuildConfig",)
+
+
+class GuildConfig(Table[GuildConfigModel], model=GuildConfigModel, name="guild_config"):
+    """Per guild settings, held in memory for every guild of this process and sharded like the gateway.
+
+    :meth:`warm` loads all of them with one query once the bot is ready, and single guilds as they join or
+    become available again, after which :meth:`settings` is a dictionary read. Writes are broadcast with
+    ``NOTIFY`` so every process, including other shards, reloads its copy of the guild right away. The old
+    copy keeps being served until the reload lands.
+    """
+
+    CHANNEL: t.ClassVar[str] = "guild_config"
+    _upsert: "Statement"
+
+    def __init__(self, database: "Database") -> None:
+        super().__init__(database)
+        self._shards: dict[int, dict[int, GuildConfigModel]] = {}
+        # guild id -> number of its latest notification, a reload only lands if no newer one arrived meanwhile
+        self._versions: dict[int, int] = {}
+        self._notifications = itertools.count(1)
+        # (guilds being warmed, those of them that changed meanwhile) of every warm in flight
+        self._warming: list[tuple[set[int], set[int]]] = []
+        self._reloads: set[asyncio.Task[None]] = set()
+        self._origin = uuid.uuid4().hex
+
+    async def setup(self) -> None:
+        await super().setup()
+        self._upsert = self.db.prepare("guild_config.upsert", self.schema.upsert)
+        await self.db.listen(self.CHANNEL, self._on_notify)
+
+    def shard_of(self, guild_id: int) -> int:
+        return (guild_id >> 22) % (self.db.bot.shard_count or 1)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards.values())
+
+    def cached(self, guild_id: int) -> GuildConfigModel | None:
+        return self._shards.get(self.shard_of(guild_id), {}).get(guild_id)
+
+    def settings(self, guild_id: int) -> GuildConfigModel | None:
+        """The guild's settings from memory, the defaults for guilds that never changed them.
+
+        ``None`` while the guild is not loaded yet, :meth:`get` reads it from the database instead.
+        """
+        return self.cached(guild_id)
+
+    def cache_stale(self, key: int) -> GuildConfigModel | None:
+        # the copy in memory is this table's cache, get_or_stale falls back to it
+        return self.cached(key)
+
+    def _store(self, record: GuildConfigModel) -> None:
+        self._shards.setdefault(self.shard_of(record.guild_id), {})[record.guild_id] = record
+
+    def _changed(self, guild_id: int) -> bool:
+        """Tell the warms in flight that the guild changed, returns whether one of them is loading it."""
+        warming = False
+        for ids, changed in self._warming:
+            if guild_id in ids:
+                changed.add(guild_id)
+                warming = True
+        return warming
+
+    def _written(self, record: GuildConfigModel) -> None:
+        self._changed(record.guild_id)
+        self._store(record)
+
+    def evict(self, guild_id: int) -> None:
+        self._shards.get(self.shard_of(guild_id), {}).pop(guild_id, None)
+        self._versions.pop(guild_id, None)
+
+    async def warm(self, guild_ids: t.Iterable[int]) -> int:
+        """Load the settings of ``guild_ids`` into memory with one query, returns how many are configured."""
+        start = time.perf_counter()
+        ids = list(guild_ids)
+        decode = self.schema.decode
+        warming: tuple[set[int], set[int]] = (set(ids), set())
+        self._warming.append(warming)
+        try:
+            records = [decode(row) for row in await self.db.fetch(self._get_many, ids, primary=True)]
+        finally:
+            self._warming.remove(warming)
+        # guilds written or notified about during the fetch keep the newer copy their write or reload stores
+        changed = warming[1]
+        configured = {record.guild_id for record in records}
+        # unconfigured guilds are stored with the defaults, a guild missing from memory is one not loaded yet
+        for guild_id in ids:
+            if guild_id not in configured and guild_id not in changed:
+                self._store(GuildConfigModel(guild_id))
+        for record in records:
+            if record.guild_id not in changed:
+                self._store(record)
+        self.db.bot.logger.info(
+            f"Warmed the settings of {len(ids)} guilds ({len(records)} configured) "
+            f"in {(time.perf_counter() - start) * 1000:.2f}ms."
+        )
+        return len(records)
+
+    async def get(self, id: int, *, session: "Session | None" = None) -> GuildConfigModel:
+        if session is None and (cached := self.cached(id)) is not None:
+            return cached
+        row = await self.executor(session).fetchrow(self._get, id)
+        record: GuildConfigModel = GuildConfigModel(id) if row is None else self.schema.decode(row)
+        if session is None:
+            self._store(record)
+        return record
+
+    async def set(self, record: GuildConfigModel, *, session: "Session | None" = None) -> GuildConfigModel:
+        """Insert or update the guild's settings and broadcast the change once it commits."""
+        record = attrs.evolve(record, updated_at=datetime.datetime.now())
+        async with self.db.transaction(session) as transaction:
+            await transaction.execute(self._upsert, *self.schema.encode(record))
+            await self.db.notify(self.CHANNEL, f"{self._origin}:{record.guild_id}", session=transaction)
+            transaction.on_commit(lambda: self._written(record))
+        return record
+
+    async def create(self, record: GuildConfigModel, *, session: "Session | None" = None) -> None:
+        await self.set(record, session=session)
+
+    async def update(self, record: GuildConfigModel, *, session: "Session | None" = None) -> None:
+        await self.set(record, session=session)
+
+    async def delete(self, record: GuildConfigModel, *, session: "Session | None" = None) -> None:
+        async with self.db.transaction(session) as transaction:
+            await transaction.execute(self._delete, record.guild_id)
+            await self.db.notify(self.CHANNEL, f"{self._origin}:{record.guild_id}", session=transaction)
+            transaction.on_commit(lambda: self._written(GuildConfigModel(record.guild_id)))
+
+    def _on_notify(self, payload: str | None) -> None:
+        if payload is None:
+            # notifications may have been missed while the LISTEN connection was down
+            self._spawn(self.warm(guild.id for guild in self.db.bot.guilds))
+            return
+        origin, _, guild_id = payload.partition(":")
+        if origin == self._origin:
+            return
+        guild = int(guild_id)
+        # guilds of other processes are not held here, they are loaded if they ever move to this one
+        if not self._changed(guild) and self.cached(guild) is None:
+            return
+        self._versions[guild] = version = next(self._notifications)
+        self._spawn(self._reload(guild, version))
+
+    async def _reload(self, guild_id: int, version: int) -> None:
+        try:
+            row = await self.db.fetchrow(self._get, guild_id, primary=True)
+        finally:
+            latest = self._versions.get(guild_id)
+            if latest == version:
+                del self._versions[guild_id]
+        if latest != version:
+            return
+        self._store(GuildConfigModel(guild_id) if row is None else self.schema.decode(row))
+
+    def _spawn(self, coroutine: t.Coroutine[t.Any, t.Any, t.Any]) -> None:
+        task = asyncio.create_task(coroutine, name="guild-config-reload")
+        self._reloads.add(task)
+        task.add_done_callback(self._reloaded)
+
+    def _reloaded(self, task: asyncio.Task[t.Any]) -> None:
+        self._reloads.discard(task)
+        if not task.cancelled() and (error := task.exception()) is not None:
+            # the copy in memory stays until the guild's next notification or warm
+            self.db.bot.logger.error(f"Failed to reload guild settings: {error!r}")
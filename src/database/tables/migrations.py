@@ -0,0 +1,9 @@
+from src.database.models import Migration as MigrationModel
+
+from ._table import Table
+
+__all__: tuple[str, ...] = ("Migrations",)
+
+
+class Migrations(Table[MigrationModel], model=MigrationModel, name="migrations"):
+    ...
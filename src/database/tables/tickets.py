@@ -0,0 +1,247 @@
+import collections
+import contextlib
+import datetime
+import typing as t
+
+from src.database.models import Ticket as TicketModel
+from src.database.schema import Index
+
+from ._table import Table
+
+if t.TYPE_CHECKING:
+    from src.database import Database, Session
+    from src.database.statements import Statement
+
+
+__all__: tuple[str, ...] = ("Tickets",)
+
+
+OPEN = "closed_at IS NULL"
+
+
+class Tickets(
+    Table[TicketModel],
+    model=TicketModel,
+    name="tickets",
+    indexes=(
+        Index(("guild_id", "id")),
+        Index(("guild_id", "id"), where=OPEN, name="tickets_open_guild_idx"),
+        Index(("guild_id", "user_id"), where=OPEN, name="tickets_open_user_idx"),
+    ),
+):
+    """Support tickets, with the number of open ones per guild and per user kept in memory.
+
+    The counters are loaded from the open ticket indexes on setup and then follow every write of the
+    table, :meth:`open`, :meth:`close` and :meth:`delete` as well as :meth:`update` and the bulk writes,
+    so limit checks and dashboards never query the table. Only the user limit of :meth:`open` is left out
+    of the bulk writes. Listings page through ``(guild_id, id)`` by keyset.
+    """
+
+    _close: "Statement"
+    _delete_returning: "Statement"
+    _open_counts: "Statement"
+    _open_for_user: "Statement"
+    _list_first: "Statement"
+    _list_after: "Statement"
+    _list_open_first: "Statement"
+    _list_open_after: "Statement"
+
+    def __init__(self, database: "Database") -> None:
+        super().__init__(database)
+        self._guild_open: collections.Counter[int] = collections.Counter()
+        self._user_open: collections.Counter[tuple[int, int]] = collections.Counter()
+
+    async def setup(self) -> None:
+        await super().setup()
+        schema = self.schema
+        columns = ", ".join(schema.names)
+        select = f"SELECT {columns} FROM tickets"
+        self._close = self.db.prepare(
+            "tickets.close",
+            f"UPDATE tickets SET closed_at = $2, closed_by = $3 WHERE id = $1 AND {OPEN} RETURNING {columns}",
+        )
+        self._delete_returning = self.db.prepare(
+            "tickets.delete_returning", f"DELETE FROM tickets WHERE id = $1 RETURNING {columns}"
+        )
+        self._open_counts = self.db.prepare(
+            "tickets.open_counts",
+            f"SELECT guild_id, user_id, count(*) FROM tickets WHERE {OPEN} GROUP BY guild_id, user_id",
+        )
+        self._open_for_user = self.db.prepare(
+            "tickets.open_for_user", f"{select} WHERE guild_id = $1 AND user_id = $2 AND {OPEN} ORDER BY id DESC"
+        )
+        self._list_first = self.db.prepare(
+            "tickets.list_first", f"{select} WHERE guild_id = $1 ORDER BY id DESC LIMIT $2"
+        )
+        self._list_after = self.db.prepare(
+            "tickets.list_after", f"{select} WHERE guild_id = $1 AND id < $2 ORDER BY id DESC LIMIT $3"
+        )
+        self._list_open_first = self.db.prepare(
+            "tickets.list_open_first", f"{select} WHERE guild_id = $1 AND {OPEN} ORDER BY id DESC LIMIT $2"
+        )
+        self._list_open_after = self.db.prepare(
+            "tickets.list_open_after",
+            f"{select} WHERE guild_id = $1 AND id < $2 AND {OPEN} ORDER BY id DESC LIMIT $3",
+        )
+        await self.recount()
+
+    async def recount(self) -> None:
+        """Reload the open ticket counters, an index only scan of the open tickets."""
+        rows = await self.db.fetch(self._open_counts, primary=True)
+        self._guild_open.clear()
+        self._user_open.clear()
+        for guild_id, user_id, count in rows:
+            self._guild_open[guild_id] += count
+            self._user_open[guild_id, user_id] = count
+
+    def _count(self, ticket: TicketModel, delta: int) -> None:
+        key = (ticket.guild_id, ticket.user_id)
+        self._guild_open[ticket.guild_id] += delta
+        self._user_open[key] += delta
+        # drop guilds and users back at zero so the counters only hold open tickets
+        if self._guild_open[ticket.guild_id] <= 0:
+            del self._guild_open[ticket.guild_id]
+        if self._user_open[key] <= 0:
+            del self._user_open[key]
+
+    def open_count(self, guild_id: int) -> int:
+        return self._guild_open.get(guild_id, 0)
+
+    def user_open_count(self, guild_id: int, user_id: int) -> int:
+        return self._user_open.get((guild_id, user_id), 0)
+
+    def has_open(self, guild_id: int, user_id: int) -> bool:
+        return (guild_id, user_id) in self._user_open
+
+    async def open(self, ticket: TicketModel, *, limit: int | None = None, session: "Session | None" = None) -> bool:
+        """Insert the open ``ticket`` unless its user already has ``limit`` open tickets in the guild.
+
+        The slot is counted before the insert, so concurrent opens of the same user cannot both pass the
+        limit, and given back when the insert or the surrounding transaction fails.
+        """
+        if not ticket.is_open:
+            raise ValueError(f"Ticket {ticket.id} is already closed and cannot be opened.")
+        if limit is not None and self.user_open_count(ticket.guild_id, ticket.user_id) >= limit:
+            return False
+        self._count(ticket, 1)
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._count(ticket, -1)
+
+        try:
+            async with self.db.transaction(session) as transaction:
+                transaction.on_rollback(release)
+                await transaction.execute(self._create, *self.schema.encode(ticket))
+        except BaseException:
+            release()
+            raise
+        return True
+
+    async def create(self, record: TicketModel, *, session: "Session | None" = None) -> None:
+        if record.is_open:
+            await self.open(record, session=session)
+        else:
+            # a closed ticket, e.g. an imported one, never counts
+            await super().create(record, session=session)
+
+    @contextlib.asynccontextmanager
+    async def _counting(
+        self, records: t.Iterable[TicketModel], *, existing: bool | None, session: "Session | None"
+    ) -> t.AsyncIterator["Session"]:
+        """Count the open state a write of ``records`` changes once it went through, undone on rollback.
+
+        ``existing`` tells which records the write touches, those whose row exists, those whose row does
+        not, or both for ``None``.
+        """
+        # the last record per id wins, as in the bulk merge
+        written = {record.id: record for record in records}
+        async with self.db.transaction(session) as transaction:
+            rows = await transaction.fetch(self._get_many, list(written))
+            decode = self.schema.decode
+            previous: dict[int, TicketModel] = {ticket.id: ticket for ticket in map(decode, rows)}
+            yield transaction
+            deltas: list[tuple[TicketModel, int]] = []
+            for id, record in written.items():
+                old = previous.get(id)
+                if existing is not None and (old is not None) != existing:
+                    continue
+                if old is not None and old.is_open:
+                    deltas.append((old, -1))
+                if record.is_open:
+                    deltas.append((record, 1))
+            for ticket, delta in deltas:
+                self._count(ticket, delta)
+            transaction.on_rollback(lambda: [self._count(ticket, -delta) for ticket, delta in deltas])
+
+    async def create_many(self, records: t.Iterable[TicketModel], *, session: "Session | None" = None) -> int:
+        records = list(records)
+        async with self._counting(records, existing=False, session=session) as transaction:
+            return await super().create_many(records, session=transaction)
+
+    async def upsert_many(self, records: t.Iterable[TicketModel], *, session: "Session | None" = None) -> int:
+        records = list(records)
+        async with self._counting(records, existing=None, session=session) as transaction:
+            return await super().upsert_many(records, session=transaction)
+
+    async def update(self, record: TicketModel, *, session: "Session | None" = None) -> None:
+        async with self._counting([record], existing=True, session=session) as transaction:
+            await super().update(record, session=transaction)
+
+    async def close(
+        self, id: int, closed_by: int | None = None, *, session: "Session | None" = None
+    ) -> TicketModel | None:
+        """Close the ticket, returns it or ``None`` when it does not exist or already was closed."""
+        async with self.db.transaction(session) as transaction:
+            row = await transaction.fetchrow(self._close, id, datetime.datetime.now(), closed_by)
+            if row is None:
+                return None
+            ticket: TicketModel = self.schema.decode(row)
+            self._count(ticket, -1)
+            transaction.on_rollback(lambda: self._count(ticket, 1))
+        return ticket
+
+    async def delete(self, record: TicketModel, *, session: "Session | None" = None) -> None:
+        async with self.db.transaction(session) as transaction:
+            row = await transaction.fetchrow(self._delete_returning, record.id)
+            if row is None:
+                return
+            ticket: TicketModel = self.schema.decode(row)
+            if ticket.is_open:
+                self._count(ticket, -1)
+                transaction.on_rollback(lambda: self._count(ticket, 1))
+
+    async def open_for_user(
+        self, guild_id: int, user_id: int, *, session: "Session | None" = None
+    ) -> list[TicketModel]:
+        """The user's open tickets in the guild, skips the query when the counters say there are none."""
+        if session is None and not self.has_open(guild_id, user_id):
+            return []
+        decode = self.schema.decode
+        rows = await self.executor(session).fetch(self._open_for_user, guild_id, user_id)
+        return [decode(row) for row in rows]
+
+    async def page(
+        self,
+        guild_id: int,
+        *,
+        open_only: bool = False,
+        before: int | None = None,
+        limit: int = 25,
+        session: "Session | None" = None,
+    ) -> list[TicketModel]:
+        """A page of the guild's tickets, newest first. Pass the last id of a page as ``before`` for the next one."""
+        if open_only and session is None and not self.open_count(guild_id):
+            return []
+        executor = self.executor(session)
+        if before is None:
+            statement = self._list_open_first if open_only else self._list_first
+            rows = await executor.fetch(statement, guild_id, limit)
+        else:
+            statement = self._list_open_after if open_only else self._list_after
+            rows = await executor.fetch(statement, guild_id, before, limit)
+        decode = self.schema.decode
+        return [decode(row) for row in rows]
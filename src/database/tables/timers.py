@@ -0,0 +1,227 @@
+import asyncio
+import contextlib
+import datetime
+import heapq
+import typing as t
+import uuid
+
+from src.database.models import Timer as TimerModel
+from src.database.schema import Index
+
+from ._table import Table
+
+if t.TYPE_CHECKING:
+    from src.database import Database, Session
+    from src.database.statements import Statement
+
+
+__all__: tuple[str, ...] = ("Timers",)
+
+
+# longest single sleep of the dispatcher, bounds the drift when the wall clock jumps
+MAX_SLEEP = 300.0
+Key = tuple[datetime.datetime, uuid.UUID]
+
+
+def _owned(first: int) -> str:
+    """Matches the timers of the shard ids in parameter ``first + 1``, out of parameter ``first`` shards."""
+    return f"(COALESCE(guild_id, 0) >> 22) % ${first} = ANY(${first + 1}::bigint[])"
+
+
+class Timers(Table[TimerModel], model=TimerModel, name="timers", indexes=(Index(("expires_at", "id")),)):
+    """Durable timers, dispatched as the ``timer_complete`` event when they expire.
+
+    Only the next ``TIMER_WINDOW`` timers by ``(expires_at, id)`` are held in memory, in a min-heap
+    served by a single dispatcher task. Once a quarter of the window is left, the following page is
+    loaded after the last key in memory, so pending timers further out only exist in the table.
+    A timer is deleted before it is dispatched, it fires at most once even with several processes.
+    Dispatching starts once the bot loaded its extensions, timers that expired meanwhile fire right away.
+
+    A process running only some of the shards dispatches the timers of their guilds, timers without a
+    guild belong to shard 0.
+    """
+
+    _window_page: "Statement"
+    _window_after: "Statement"
+    _pop_due: "Statement"
+
+    def __init__(self, database: "Database") -> None:
+        super().__init__(database)
+        self.window_size = database.bot.config.TIMER_WINDOW
+        self._heap: list[Key] = []
+        # the timers in memory, heap entries missing here were cancelled and are skipped once they surface
+        self._window: dict[uuid.UUID, TimerModel] = {}
+        # the key of the last timer loaded, every timer up to it is in memory and all of them once exhausted
+        self._horizon: Key | None = None
+        self._exhausted = False
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        # (shard count, shard ids) when this process only runs some of the shards
+        self._shard_args: tuple[t.Any, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    async def setup(self) -> None:
+        await super().setup()
+        columns = ", ".join(self.schema.names)
+        shard_ids, shard_count = getattr(self.db.bot, "shard_ids", None), self.db.bot.shard_count
+        if shard_ids and shard_count:
+            self._shard_args = (shard_count, list(shard_ids))
+            page = f" WHERE {_owned(2)}"
+            after = f" AND {_owned(4)}"
+        else:
+            self._shard_args = ()
+            page = after = ""
+        self._window_page = self.db.prepare(
+            f"timers.window_page{'_sharded' if page else ''}",
+            f"SELECT {columns} FROM timers{page} ORDER BY expires_at, id LIMIT $1",
+        )
+        self._window_after = self.db.prepare(
+            f"timers.window_after{'_sharded' if after else ''}",
+            f"SELECT {columns} FROM timers WHERE (expires_at, id) > ($1, $2){after} ORDER BY expires_at, id LIMIT $3",
+        )
+        self._pop_due = self.db.prepare("timers.pop_due", "DELETE FROM timers WHERE id = ANY($1::uuid[]) RETURNING id")
+        # the window is first loaded by the dispatcher, once migrations added any new columns to the table
+        self._task = asyncio.create_task(self._dispatcher(), name="timer-dispatcher")
+
+    async def teardown(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def owns(self, timer: TimerModel) -> bool:
+        """Whether this process dispatches the timer, see the class docstring."""
+        if not self._shard_args:
+            return True
+        shard_count, shard_ids = self._shard_args
+        return ((timer.guild_id or 0) >> 22) % shard_count in shard_ids
+
+    def _in_window(self, key: Key) -> bool:
+        return self._exhausted or (self._horizon is not None and key <= self._horizon)
+
+    def _push(self, timer: TimerModel) -> None:
+        self._window[timer.id] = timer
+        heapq.heappush(self._heap, (timer.expires_at, timer.id))
+        if len(self._window) > 2 * self.window_size:
+            self._trim()
+
+    def _trim(self) -> None:
+        """Shrink the window back to its size after many timers were scheduled into it."""
+        keys = sorted((timer.expires_at, timer.id) for timer in self._window.values())
+        kept, dropped = keys[: self.window_size], keys[self.window_size :]
+        for _, id in dropped:
+            del self._window[id]
+        self._heap = kept
+        self._horizon = kept[-1]
+        self._exhausted = False
+
+    async def _refill(self) -> None:
+        limit = self.window_size - len(self._window)
+        if self._horizon is None:
+            rows = await self.db.fetch(self._window_page, limit, *self._shard_args, primary=True)
+        else:
+            rows = await self.db.fetch(self._window_after, *self._horizon, limit, *self._shard_args, primary=True)
+        decode = self.schema.decode
+        for row in rows:
+            timer: TimerModel = decode(row)
+            self._window[timer.id] = timer
+            heapq.heappush(self._heap, (timer.expires_at, timer.id))
+            self._horizon = (timer.expires_at, timer.id)
+        self._exhausted = len(rows) < limit
+
+    async def schedule(
+        self,
+        event: str,
+        when: datetime.datetime | datetime.timedelta,
+        *,
+        extra: dict[str, t.Any] | None = None,
+        guild_id: int | None = None,
+        session: "Session | None" = None,
+    ) -> TimerModel:
+        """Store a timer firing ``event`` at ``when``, or after it when given a duration."""
+        now = datetime.datetime.now()
+        expires_at = now + when if isinstance(when, datetime.timedelta) else when
+        timer = TimerModel(uuid.uuid4(), event, expires_at, now, extra or {}, guild_id)
+        await self.create(timer, session=session)
+        return timer
+
+    async def create(self, record: TimerModel, *, session: "Session | None" = None) -> None:
+        await super().create(record, session=session)
+        if session is not None:
+            session.on_commit(lambda: self._scheduled(record))
+        else:
+            self._scheduled(record)
+
+    def _scheduled(self, timer: TimerModel) -> None:
+        if self.owns(timer) and self._in_window((timer.expires_at, timer.id)):
+            self._push(timer)
+            self._wake.set()
+
+    async def cancel(self, id: uuid.UUID, *, session: "Session | None" = None) -> bool:
+        """Delete a pending timer, returns whether it still existed."""
+        if session is None:
+            deleted = await self.db.fetch(self._pop_due, [id], primary=True)
+        else:
+            deleted = await session.fetch(self._pop_due, [id])
+            # a rolled back cancel leaves the timer pending, it has to stay in the window
+            session.on_commit(lambda: self._window.pop(id, None))
+            return bool(deleted)
+        self._window.pop(id, None)
+        return bool(deleted)
+
+    async def delete(self, record: TimerModel, *, session: "Session | None" = None) -> None:
+        await self.cancel(record.id, session=session)
+
+    async def _dispatcher(self) -> None:
+        # timers are deleted as they fire, the cogs listening for them have to be loaded first
+        await self.db.bot.wait_until_extensions_ready()
+        backoff = 1.0
+        while True:
+            try:
+                await self._dispatch_due()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.db.bot.logger.error(f"Timer dispatch failed, retrying in {backoff:.0f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    async def _dispatch_due(self) -> None:
+        if not self._exhausted and len(self._window) <= self.window_size // 4:
+            await self._refill()
+        # drop the entries of cancelled timers at the top so the sleep targets a live one
+        while self._heap and self._heap[0][1] not in self._window:
+            heapq.heappop(self._heap)
+        timeout = MAX_SLEEP
+        if self._heap:
+            timeout = min(timeout, (self._heap[0][0] - datetime.datetime.now()).total_seconds())
+        if timeout > 0:
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            return
+        now = datetime.datetime.now()
+        due: list[TimerModel] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, id = heapq.heappop(self._heap)
+            if (timer := self._window.pop(id, None)) is not None:
+                due.append(timer)
+        if not due:
+            return
+        try:
+            rows = await self.db.fetch(self._pop_due, [timer.id for timer in due], primary=True)
+        except BaseException:
+            for timer in due:
+                self._push(timer)
+            raise
+        fired = {row[0] for row in rows}
+        for timer in due:
+            # timers missing from the result were cancelled or fired by another process meanwhile
+            if timer.id in fired:
+                self.db.bot.dispatch("timer_complete", timer)
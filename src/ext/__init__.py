@@ -11,9 +11,12 @@ __all__: tuple[str, ...] = ("BaseCog",)
 
 class BaseCog(commands.Cog):
     hidden: bool
+    deferred: bool
 
     def __init__(self, bot: "TemplateBot") -> None:
         self.bot = bot
 
-    def __init_subclass__(cls, hidden: bool = False) -> None:
+    def __init_subclass__(cls, hidden: bool = False, deferred: bool = False) -> None:
         cls.hidden = hidden
+        # deferred cogs are only loaded once the bot is ready, read from the source by the extension manifest
+        cls.deferred = deferred
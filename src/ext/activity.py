@@ -0,0 +1,16 @@
+import disnake
+from disnake.ext import commands
+
+from . import BaseCog
+
+
+class Activity(BaseCog, hidden=True):
+    """Counts guild messages into the per minute activity statistics."""
+
+    @commands.Cog.listener(disnake.Event.message)
+    async def on_message(self, message: disnake.Message) -> None:
+        if message.guild is None or message.author.bot or message.webhook_id is not None:
+            return
+        # without the message content intent the content is empty for most messages, they count as 0 characters
+        characters = len(message.content) if self.bot.intents.message_content else 0
+        self.bot.db.activity.record(message.guild.id, message.channel.id, message.author.id, characters)
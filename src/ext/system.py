@@ -78,14 +78,10 @@ class System(BaseCog, hidden=True):
         if error_data is BotExceptions.UKNOWN.value:
             assert isinstance(error_data, ExceptionResponse)
             desc = self.bot.embeds.ansi(str(error_data.message), Colors.RED)
-            await inter.edit_original_message(
-                embed=disnake.Embed(title=title, description=desc, color=disnake.Color.red())
-            )
+            await self.bot.respond(inter, embed=disnake.Embed(title=title, description=desc, color=disnake.Color.red()))
             raise error
         desc = self.bot.embeds.ansi(str(error_data), Colors.RED)
-        await inter.edit_original_message(
-            embed=disnake.Embed(title=title, description=desc, colour=disnake.Color.red())
-        )
+        await self.bot.respond(inter, embed=disnake.Embed(title=title, description=desc, colour=disnake.Color.red()))
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: disnake.Guild) -> None:
@@ -116,6 +112,7 @@ class System(BaseCog, hidden=True):
     async def on_guild_remove(self, guild: disnake.Guild) -> None:
         channel = await self._load_channel()
         self.bot.logger.info(f"Left guild {guild} with {len(guild.members)} members.")
+        self.bot.db.guildconfig.evict(guild.id)
         await channel.send(embed=self.bot.embeds.log_guild_leave(guild))
 
     @commands.message_command(
@@ -141,3 +138,57 @@ class System(BaseCog, hidden=True):
         stdout, stderr = await evaluator.f_eval(code=code, renv=renv)
         embeds = self.bot.embeds.build_error_embed("Code Execution", stdout + stderr)
         await ClassicPaginator.start(inter, items=list(embeds), timeout=60)
+
+    @commands.slash_command(
+        name="database",
+        description="Show database pool usage, acquire wait and query time metrics.",
+        guild_ids=[GUILD_ID],
+    )
+    async def database(self, inter: disnake.ApplicationCommandInteraction) -> None:
+        """
+        Show database pool usage, acquire wait and query time metrics.
+
+        Parameters
+        ----------
+        inter : disnake.ApplicationCommandInteraction
+            The interaction that invoked the command
+        """
+        await self.bot.respond(inter, embed=self.bot.embeds.database_embed())
+
+    @commands.slash_command(
+        name="queries",
+        description="Show the slowest database statements.",
+        guild_ids=[GUILD_ID],
+    )
+    async def queries(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        sort: str = commands.Param(default="total", choices=["total", "p95", "p99", "calls", "slow"]),
+    ) -> None:
+        """
+        Show the slowest database statements.
+
+        Parameters
+        ----------
+        inter : disnake.ApplicationCommandInteraction
+            The interaction that invoked the command
+        sort : str
+            The metric to rank the statements by
+        """
+        await self.bot.respond(inter, embed=self.bot.embeds.queries_embed(sort))
+
+    @commands.slash_command(
+        name="cache",
+        description="Show the approximate size of the gateway caches.",
+        guild_ids=[GUILD_ID],
+    )
+    async def cache(self, inter: disnake.ApplicationCommandInteraction) -> None:
+        """
+        Show the approximate size of the gateway caches.
+
+        Parameters
+        ----------
+        inter : disnake.ApplicationCommandInteraction
+            The interaction that invoked the command
+        """
+        await self.bot.respond(inter, embed=self.bot.embeds.cache_embed())
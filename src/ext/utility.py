@@ -43,7 +43,7 @@ class Utility(BaseCog):
         _list.extend(self.command_names)
         return _list[:25]
 
-    @commands.slash_command(name="clear", description="Clear a certain amount of messages.")
+    @commands.slash_command(name="clear", description="Clear a certain amount of messages.", extras={"ephemeral": True})
     async def clear_command(
         self,
         inter: disnake.ApplicationCommandInteraction,
@@ -61,7 +61,7 @@ class Utility(BaseCog):
         channel: disnake.TextChannel = typing.cast(disnake.TextChannel, inter.channel)
         await channel.purge(limit=amount + 1)
         embed = self.bot.embeds.yes_embed("Purged", f"Purged {amount} messages.")
-        await inter.send(embed=embed, ephemeral=True)
+        await self.bot.respond(inter, embed=embed, ephemeral=True)
 
     @commands.slash_command(name="ping")
     async def ping(self, interaction: disnake.ApplicationCommandInteraction) -> None:
@@ -74,4 +74,4 @@ class Utility(BaseCog):
             The interaction that invoked this command.
         """
         embed = await self.bot.embeds.ping_embed()
-        await interaction.edit_original_response(embed=embed)
+        await self.bot.respond(interaction, embed=embed)
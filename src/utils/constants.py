@@ -56,9 +56,11 @@ class CHANNELS(enum.IntEnum):
 class PATHS(str, BaseEnum):
     BASE = "src"
     BIN = "src/bin"
+    MANIFEST = "src/bin/manifest.json"
     DATABASE = "src/database"
     EXTENSIONS = "src/ext"
     MIGRATIONS = "src/bin/migrations"
+    BASELINES = "src/bin/migrations/baseline"
     TABLES = "src/database/tables"
 
 
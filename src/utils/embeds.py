@@ -2,10 +2,12 @@ import io
 import typing as t
 
 import disnake
+import humanfriendly
 
 from src.core.errors import SpamGuilds
 
 from .ansi import AnsiBuilder, BackgroundColors, Colors, Styles
+from .memory import cache_usage, rss
 
 if t.TYPE_CHECKING:
     from src import TemplateBot
@@ -170,11 +172,120 @@ class Embeds:
             Colors.MAGENTA,
             Styles.BOLD,
         )
+        metrics = self.bot.db.metrics
+        pool_ = self.ansi.from_string_to_ansi(
+            f"Pool: {metrics.in_use}/{metrics.max_size} in use, {metrics.idle} idle\n"
+            f"Acquire p95: {metrics.acquire.percentile(0.95) * 1000:.2f}ms | "
+            f"Query p95: {metrics.query.percentile(0.95) * 1000:.2f}ms",
+            Colors.YELLOW,
+        )
         embed = disnake.Embed(
             title="🏓 Pong!",
-            description=f"{bot_}{db_}",
+            description=f"{bot_}{db_}{pool_}",
             color=disnake.Color.green(),
         )
         embed.timestamp = disnake.utils.utcnow()
         embed.set_thumbnail(url=self.bot.user.display_avatar)
         return embed
+
+    def database_embed(self) -> BaseEmbed:
+        metrics = self.bot.db.metrics
+        breaker = self.bot.db.breaker
+        activity = self.bot.db.activity
+        embed = BaseEmbed(
+            user=self.bot.user,
+            title="🗄️ Database pool",
+            description=self.ansi.from_string_to_ansi(
+                f"Size: {metrics.size} (min {metrics.min_size}, max {metrics.max_size})\n"
+                f"In use: {metrics.in_use} | Idle: {metrics.idle}\n"
+                f"Breaker: {breaker.state.value} | failure rate {breaker.recent_failure_rate:.0%} | "
+                f"{breaker.stats.trips} trips, {breaker.stats.rejected} rejected\n"
+                f"Activity: {len(activity)} buckets pending | {activity.stats.recorded:,} recorded, "
+                f"{activity.stats.dropped:,} dropped",
+                Colors.CYAN,
+                Styles.BOLD,
+            ),
+            color=disnake.Color.blurple(),
+        )
+        for name, histogram in (("Acquire wait", metrics.acquire), ("Query time", metrics.query)):
+            embed.add_field(
+                name=name,
+                value=self.ansi.from_string_to_ansi(
+                    f"count {histogram.count:,}\n"
+                    f"mean  {histogram.mean * 1000:.2f}ms\n"
+                    f"p50   {histogram.percentile(0.5) * 1000:.2f}ms\n"
+                    f"p95   {histogram.percentile(0.95) * 1000:.2f}ms\n"
+                    f"p99   {histogram.percentile(0.99) * 1000:.2f}ms\n"
+                    f"max   {histogram.max * 1000:.2f}ms",
+                    Colors.MAGENTA,
+                ),
+                inline=True,
+            )
+        if (replica := self.bot.db.replica_metrics) is not None:
+            lag = self.bot.db.replica_lag
+            embed.add_field(
+                name="Replica",
+                value=self.ansi.from_string_to_ansi(
+                    f"{'serving reads' if self.bot.db.replica_available else 'bypassed'}\n"
+                    f"lag   {'unreachable' if lag is None else f'{lag:.2f}s'}\n"
+                    f"pool  {replica.in_use}/{replica.max_size} in use, {replica.idle} idle\n"
+                    f"wait  p95 {replica.acquire.percentile(0.95) * 1000:.2f}ms\n"
+                    f"query p95 {replica.query.percentile(0.95) * 1000:.2f}ms\n"
+                    f"breaker {self.bot.db.replica_breaker.state.value}",
+                    Colors.GREEN if self.bot.db.replica_available else Colors.RED,
+                ),
+                inline=False,
+            )
+        return embed
+
+    def queries_embed(self, by: str = "total", count: int = 10) -> BaseEmbed:
+        profiler = self.bot.db.profiler
+        embed = BaseEmbed(
+            user=self.bot.user,
+            title="🐢 Top queries",
+            description=self.ansi.from_string_to_ansi(
+                f"{len(profiler)} statements, sorted by {by}\n" f"Slow threshold: {profiler.threshold * 1000:.0f}ms",
+                Colors.CYAN,
+                Styles.BOLD,
+            ),
+            color=disnake.Color.blurple(),
+        )
+        for stats in profiler.top(count, by=by):
+            latency = stats.latency
+            embed.add_field(
+                name=stats.label[:250],
+                value=self.ansi.from_string_to_ansi(
+                    f"calls {stats.calls:,} | rows {stats.rows:,} | slow {stats.slow:,}\n"
+                    f"total {stats.total_time * 1000:.2f}ms | mean {latency.mean * 1000:.2f}ms\n"
+                    f"p50 {latency.percentile(0.5) * 1000:.2f}ms | p95 {latency.percentile(0.95) * 1000:.2f}ms | "
+                    f"p99 {latency.percentile(0.99) * 1000:.2f}ms",
+                    Colors.YELLOW if stats.slow else Colors.MAGENTA,
+                ),
+                inline=False,
+            )
+        return embed
+
+    def cache_embed(self) -> BaseEmbed:
+        profile = self.bot.config.CACHE_PROFILE
+        caches = cache_usage(self.bot)
+        total = sum(cache.size for cache in caches)
+        embed = BaseEmbed(
+            user=self.bot.user,
+            title="🧠 Gateway caches",
+            description=self.ansi.from_string_to_ansi(
+                f"Profile: {profile.name} | max messages {profile.max_messages}\n"
+                f"RSS: {humanfriendly.format_size(rss())} | caches ~{humanfriendly.format_size(total)}",
+                Colors.CYAN,
+                Styles.BOLD,
+            ),
+            color=disnake.Color.blurple(),
+        )
+        for cache in caches:
+            embed.add_field(
+                name=cache.name,
+                value=self.ansi.from_string_to_ansi(
+                    f"{cache.count:,} objects\n~{humanfriendly.format_size(cache.size)}", Colors.MAGENTA
+                ),
+                inline=True,
+            )
+        return embed
@@ -54,6 +54,8 @@ class Help:
         return embeds
 
     async def send_help(self) -> None:
+        # the command mentions need the global commands' IDs
+        await self.bot.load_commands()
         if self.argument is None:
             await self.send_bot_help()
         elif (cog := t.cast(BaseCog | None, self.bot.get_cog(self.argument))) is not None:
@@ -70,11 +72,12 @@ class Help:
             await self.invalid_help_object()
 
     async def invalid_help_object(self) -> None:
-        await self.interaction.send(
+        await self.bot.respond(
+            self.interaction,
             embed=BaseEmbed(
                 description=f"`{self.argument}` is an invalid help argument.",
                 user=self.interaction.user,
-            )
+            ),
         )
 
     async def send_bot_help(self) -> None:
@@ -97,7 +100,7 @@ class Help:
             embed.add_field(cog.qualified_name + " Commands", txt, inline=False)
             selectors[cog.qualified_name] = self.create_cog_help(cog)
         view = MenuPaginator(user, items={"Home": [embed]} | selectors)
-        await self.interaction.send(embed=embed, view=view)
+        await self.bot.respond(self.interaction, embed=embed, view=view)
         view.message = await self.interaction.original_response()
 
     async def send_command_help(self, command: commands.InvokableSlashCommand | commands.SubCommand) -> None:
@@ -120,7 +123,7 @@ class Help:
                 for arg in o
             )
             embed.description += "**Command Arguments:**\n" + txt
-        await self.interaction.send(embed=embed)
+        await self.bot.respond(self.interaction, embed=embed)
 
     async def send_group_help(self, group: commands.SubCommandGroup) -> None:
         embed = BaseEmbed(color=disnake.Color.green(), user=self.interaction.user)
@@ -146,4 +149,4 @@ class Help:
             user,
             items=embeds,
         )
-        await self.interaction.send(embed=embeds[0], view=view)
+        await self.bot.respond(self.interaction, embed=embeds[0], view=view)
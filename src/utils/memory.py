@@ -0,0 +1,90 @@
+import itertools
+import sys
+import typing as t
+
+import attrs
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+if t.TYPE_CHECKING:
+    from src import TemplateBot
+
+
+__all__: tuple[str, ...] = (
+    "CacheUsage",
+    "cache_usage",
+    "rss",
+)
+
+
+# objects per cache that are measured, the total is extrapolated from their mean size
+SAMPLE = 200
+PLAIN = (str, bytes, int, float, bool, type(None))
+CONTAINERS = (tuple, list, set, frozenset, dict)
+
+
+@attrs.define(frozen=True, slots=True)
+class CacheUsage:
+    name: str
+    count: int
+    size: int
+
+
+def _size(value: t.Any, depth: int = 0) -> int:
+    """Bytes of ``value`` and the plain data it holds, other objects are counted by their own cache."""
+    size = sys.getsizeof(value)
+    if depth > 3 or isinstance(value, PLAIN):
+        return size
+    if isinstance(value, dict):
+        return size + sum(_size(k, depth + 1) + _size(v, depth + 1) for k, v in value.items() if isinstance(v, PLAIN))
+    if isinstance(value, CONTAINERS):
+        return size + sum(_size(item, depth + 1) for item in value if isinstance(item, PLAIN))
+    slots = itertools.chain.from_iterable(getattr(cls, "__slots__", ()) for cls in type(value).__mro__)
+    attributes = [getattr(value, name, None) for name in slots if isinstance(name, str)]
+    attributes.extend(getattr(value, "__dict__", {}).values())
+    return size + sum(_size(item, depth + 1) for item in attributes if isinstance(item, PLAIN + CONTAINERS))
+
+
+def _estimate(name: str, count: int, objects: t.Iterable[t.Any]) -> CacheUsage:
+    sample = list(itertools.islice(objects, SAMPLE))
+    mean = sum(_size(obj) for obj in sample) / len(sample) if sample else 0
+    return CacheUsage(name, count, int(mean * count))
+
+
+def cache_usage(bot: "TemplateBot") -> list[CacheUsage]:
+    """Approximate object counts and memory of the gateway caches, largest first."""
+    guilds = bot.guilds
+
+    def per_guild(name: str, attribute: str) -> CacheUsage:
+        count = sum(len(getattr(guild, attribute)) for guild in guilds)
+        objects = itertools.chain.from_iterable(getattr(guild, attribute) for guild in guilds)
+        return _estimate(name, count, objects)
+
+    caches = [
+        _estimate("Guilds", len(guilds), guilds),
+        per_guild("Members", "members"),
+        per_guild("Channels", "channels"),
+        per_guild("Roles", "roles"),
+        _estimate("Users", len(bot.users), bot.users),
+        _estimate("Emojis", len(bot.emojis), bot.emojis),
+        _estimate("Stickers", len(bot.stickers), bot.stickers),
+        _estimate("Messages", len(bot.cached_messages), bot.cached_messages),
+        _estimate("Private channels", len(bot.private_channels), bot.private_channels),
+    ]
+    return sorted(caches, key=lambda cache: -cache.size)
+
+
+def rss() -> int:
+    """The resident memory of this process in bytes, its peak where the current value is unavailable, 0 on Windows."""
+    if resource is None:
+        return 0
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
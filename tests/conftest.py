@@ -0,0 +1,57 @@
+import asyncio
+import typing as t
+
+import pytest
+
+from src.core.env import TEMPLATEENV
+from src.core.logger import Logger
+from src.database import Database
+from src.database.backends import SQLiteBackend
+
+Test = t.Callable[..., t.Awaitable[None]]
+
+
+class Bot:
+    """The parts of the bot a :class:`Database` uses, with every dispatched event recorded."""
+
+    def __init__(self, backend: SQLiteBackend) -> None:
+        self.config = TEMPLATEENV
+        self.logger = Logger(name="tests")
+        self.guilds: list[t.Any] = []
+        self.shard_count = None
+        self.events: list[tuple[str, tuple[t.Any, ...]]] = []
+        self.extensions_ready = asyncio.Event()
+        self.extensions_ready.set()
+        self.db = Database(self, backend)
+
+    def dispatch(self, event: str, *args: t.Any) -> None:
+        self.events.append((event, args))
+
+    async def wait_until_extensions_ready(self) -> None:
+        await self.extensions_ready.wait()
+
+
+@pytest.fixture
+def run() -> t.Callable[..., None]:
+    """Run ``test(*bots)`` with ``processes`` set up bots sharing one in-memory SQLite database.
+
+    ``attributes`` are set on every bot before its database is set up, e.g. ``shard_ids``.
+    """
+
+    def runner(test: Test, *, processes: int = 1, **attributes: t.Any) -> None:
+        async def main() -> None:
+            backend = SQLiteBackend()
+            bots = [Bot(backend) for _ in range(processes)]
+            for bot in bots:
+                for name, value in attributes.items():
+                    setattr(bot, name, value)
+                await bot.db.setup()
+            try:
+                await test(*bots)
+            finally:
+                for bot in bots:
+                    await bot.db.close()
+
+        asyncio.run(main())
+
+    return runner
@@ -0,0 +1,34 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+from dotenv import dotenv_values
+
+from src.core.env import Variable
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+
+def test_empty_value_falls_back_to_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TEST_VARIABLE", "")
+    assert Variable(name="TEST_VARIABLE", default=3, cast=int)() == 3
+    assert Variable(name="TEST_VARIABLE")() == ""
+    monkeypatch.setenv("TEST_VARIABLE", "7")
+    assert Variable(name="TEST_VARIABLE", default=3, cast=int)() == 7
+
+
+def test_sample_env_loads() -> None:
+    """A copy of .env.sample with only the required keys filled in starts the bot's environment."""
+    sample = {name: value or "" for name, value in dotenv_values(ROOT / ".env.sample").items()}
+    env = {name: value for name, value in os.environ.items() if name not in sample} | sample | {"TOKEN": "token"}
+    result = subprocess.run(
+        [sys.executable, "-c", "from src.core.env import TEMPLATEENV; print(TEMPLATEENV.PGPORT)"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "5432"
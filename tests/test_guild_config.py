@@ -0,0 +1,73 @@
+import asyncio
+
+from src.database.models import GuildConfig
+
+
+def test_notify_reloads_other_processes(run) -> None:
+    async def test(writer, reader) -> None:
+        assert await reader.db.guildconfig.warm([1, 2]) == 0
+        assert reader.db.guildconfig.settings(1) == GuildConfig(1)
+        assert reader.db.guildconfig.settings(3) is None
+        await writer.db.guildconfig.set(GuildConfig(1, locale="de"))
+        # the old copy is served until the reload lands
+        assert reader.db.guildconfig.settings(1) == GuildConfig(1)
+        await asyncio.sleep(0.1)
+        assert reader.db.guildconfig.settings(1).locale == "de"
+        await writer.db.guildconfig.delete(GuildConfig(1))
+        await asyncio.sleep(0.1)
+        assert reader.db.guildconfig.settings(1) == GuildConfig(1)
+        assert not reader.db.guildconfig._versions
+
+    run(test, processes=2)
+
+
+def test_failed_reload_keeps_the_old_copy(run) -> None:
+    async def test(writer, reader) -> None:
+        await writer.db.guildconfig.set(GuildConfig(1, locale="de"))
+        await reader.db.guildconfig.warm([1])
+
+        async def unavailable(*args, **kwargs):
+            raise RuntimeError("down")
+
+        fetchrow, reader.db.fetchrow = reader.db.fetchrow, unavailable
+        await writer.db.guildconfig.set(GuildConfig(1, locale="fr"))
+        await asyncio.sleep(0.1)
+        reader.db.fetchrow = fetchrow
+        assert reader.db.guildconfig.settings(1).locale == "de"
+        assert not reader.db.guildconfig._versions
+
+    run(test, processes=2)
+
+
+def test_guilds_not_loaded_are_skipped(run) -> None:
+    async def test(writer, reader) -> None:
+        await writer.db.guildconfig.set(GuildConfig(5, locale="de"))
+        await asyncio.sleep(0.1)
+        assert reader.db.guildconfig.settings(5) is None
+        assert (await reader.db.guildconfig.get(5)).locale == "de"
+        assert reader.db.guildconfig.settings(5).locale == "de"
+
+    run(test, processes=2)
+
+
+def test_warm_keeps_changes_made_during_its_fetch(run) -> None:
+    async def test(writer, reader) -> None:
+        fetch, release = reader.db.fetch, asyncio.Event()
+
+        async def slow(*args, **kwargs):
+            rows = await fetch(*args, **kwargs)
+            await release.wait()
+            return rows
+
+        reader.db.fetch = slow
+        warm = asyncio.create_task(reader.db.guildconfig.warm([1, 2]))
+        await asyncio.sleep(0.05)
+        reader.db.fetch = fetch
+        await writer.db.guildconfig.set(GuildConfig(1, locale="de"))
+        await asyncio.sleep(0.1)
+        release.set()
+        await warm
+        assert reader.db.guildconfig.settings(1).locale == "de"
+        assert reader.db.guildconfig.settings(2) == GuildConfig(2)
+
+    run(test, processes=2)
@@ -0,0 +1,39 @@
+import datetime
+
+from src.database.models import Ticket
+
+NOW = datetime.datetime(2024, 1, 1)
+
+
+def test_keyset_paging_visits_every_record_once(run) -> None:
+    async def test(bot) -> None:
+        tickets = bot.db.tickets
+        await tickets.create_many([Ticket(id, 1, id, NOW) for id in range(1, 26)])
+        statements = bot.db.statements
+        ids = [ticket.id async for ticket in tickets.iter_all(keyset=True, prefetch=10)]
+        assert ids == list(range(1, 26))
+        # two full pages and a short last one
+        assert (statements["tickets.page_first"].calls, statements["tickets.page_after"].calls) == (1, 2)
+
+    run(test)
+
+
+def test_keyset_paging_starts_after_the_key(run) -> None:
+    async def test(bot) -> None:
+        tickets = bot.db.tickets
+        await tickets.create_many([Ticket(id, 1, id, NOW) for id in range(1, 21)])
+        ids = [ticket.id async for ticket in tickets.iter_all(keyset=True, prefetch=10, after=15)]
+        assert ids == list(range(16, 21))
+        assert [ticket.id async for ticket in tickets.iter_all(keyset=True, prefetch=5, after=20)] == []
+
+    run(test)
+
+
+def test_cursor_iteration_matches_keyset_paging(run) -> None:
+    async def test(bot) -> None:
+        tickets = bot.db.tickets
+        await tickets.create_many([Ticket(id, 1, id, NOW) for id in range(1, 13)])
+        cursor = sorted([ticket.id async for ticket in tickets.iter_all(prefetch=5)])
+        assert cursor == [ticket.id async for ticket in tickets.iter_all(keyset=True, prefetch=5)]
+
+    run(test)
@@ -0,0 +1,63 @@
+import asyncio
+import datetime
+
+from src.database.loader import BatchLoader
+from src.database.models import Ticket
+
+
+def test_concurrent_loads_share_one_batch() -> None:
+    calls: list[list[int]] = []
+
+    async def load(keys: list[int]) -> dict[int, str]:
+        calls.append(keys)
+        return {key: str(key) for key in keys if key != 3}
+
+    async def main() -> None:
+        loader: BatchLoader[int, str] = BatchLoader(load)
+        results = await asyncio.gather(*(loader.load(key) for key in (1, 2, 2, 3, 1)))
+        assert results == ["1", "2", "2", None, "1"]
+        assert calls == [[1, 2, 3]]
+        assert (loader.stats.requests, loader.stats.deduplicated, loader.stats.batches) == (5, 2, 1)
+
+    asyncio.run(main())
+
+
+def test_batches_are_split_at_max_batch() -> None:
+    calls: list[list[int]] = []
+
+    async def load(keys: list[int]) -> dict[int, int]:
+        calls.append(keys)
+        return {key: key for key in keys}
+
+    async def main() -> None:
+        loader: BatchLoader[int, int] = BatchLoader(load, max_batch=2)
+        assert await asyncio.gather(*(loader.load(key) for key in range(5))) == list(range(5))
+        assert calls == [[0, 1], [2, 3], [4]]
+
+    asyncio.run(main())
+
+
+def test_load_errors_reach_every_caller() -> None:
+    async def load(keys: list[int]) -> dict[int, int]:
+        raise RuntimeError("down")
+
+    async def main() -> None:
+        loader: BatchLoader[int, int] = BatchLoader(load)
+        results = await asyncio.gather(loader.load(1), loader.load(1), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not loader._loading
+
+    asyncio.run(main())
+
+
+def test_table_gets_are_batched(run) -> None:
+    async def test(bot) -> None:
+        tickets = bot.db.tickets
+        now = datetime.datetime.now()
+        await tickets.create_many([Ticket(id, 1, id, now) for id in range(1, 6)])
+        found = await asyncio.gather(*(tickets.get(id) for id in (1, 2, 2, 5, 9)))
+        assert [ticket and ticket.id for ticket in found] == [1, 2, 2, 5, None]
+        assert tickets.loader is not None
+        assert (tickets.loader.stats.batches, tickets.loader.stats.keys, tickets.loader.stats.deduplicated) == (1, 4, 1)
+
+    run(test)
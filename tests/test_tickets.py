@@ -0,0 +1,88 @@
+import asyncio
+import datetime
+
+import pytest
+
+from src.database.models import Ticket
+
+NOW = datetime.datetime(2024, 1, 1)
+
+
+def ticket(id: int, user_id: int, *, guild_id: int = 1, closed: bool = False) -> Ticket:
+    return Ticket(id, guild_id, user_id, NOW, closed_at=NOW if closed else None)
+
+
+def test_open_respects_the_user_limit(run) -> None:
+    async def test(bot) -> None:
+        tickets = bot.db.tickets
+        opened = await asyncio.gather(*(tickets.open(ticket(id, 7), limit=1) for id in range(1, 6)))
+        assert opened.count(True) == 1
+        assert (tickets.open_count(1), tickets.user_open_count(1, 7)) == (1, 1)
+
+    run(test)
+
+
+def test_open_rejects_closed_tickets(run) -> None:
+    async def test(bot) -> None:
+        with pytest.raises(ValueError):
+            await bot.db.tickets.open(ticket(1, 7, closed=True))
+        await bot.db.tickets.create(ticket(1, 7, closed=True))
+        assert bot.db.tickets.open_count(1) == 0
+
+    run(test)
+
+
+def test_close_and_delete_count_down(run) -> None:
+    async def test(bot) -> None:
+        tickets = bot.db.tickets
+        for id in range(1, 4):
+            await tickets.open(ticket(id, id))
+        assert await tickets.close(1, 99) is not None
+        assert await tickets.close(1, 99) is None
+        await tickets.delete(ticket(2, 2))
+        assert tickets.open_count(1) == 1
+        assert not tickets.has_open(1, 1) and not tickets.has_open(1, 2) and tickets.has_open(1, 3)
+
+    run(test)
+
+
+def test_rolled_back_open_is_given_back(run) -> None:
+    async def test(bot) -> None:
+        with pytest.raises(RuntimeError):
+            async with bot.db.transaction() as session:
+                await bot.db.tickets.open(ticket(1, 7), session=session)
+                raise RuntimeError
+        assert bot.db.tickets.open_count(1) == 0
+
+    run(test)
+
+
+def test_bulk_writes_and_updates_keep_the_counters(run) -> None:
+    async def test(bot) -> None:
+        tickets = bot.db.tickets
+        for id in range(1, 5):
+            await tickets.open(ticket(id, id % 2))
+        # four of them already exist and are skipped, one is closed
+        await tickets.create_many([ticket(id, id % 3) for id in range(1, 16)] + [ticket(99, 5, closed=True)])
+        assert tickets.open_count(1) == 15
+        await tickets.upsert_many([ticket(1, 1, closed=True), ticket(2, 0, closed=True), ticket(2, 0), ticket(50, 1)])
+        await tickets.update(ticket(3, 1, closed=True))
+        # updating a missing ticket touches no row
+        await tickets.update(ticket(500, 1))
+        counts = (tickets.open_count(1), tickets.user_open_count(1, 0), tickets.user_open_count(1, 1))
+        await tickets.recount()
+        assert counts == (tickets.open_count(1), tickets.user_open_count(1, 0), tickets.user_open_count(1, 1))
+        assert counts[0] == 14
+
+    run(test)
+
+
+def test_rolled_back_bulk_write_is_undone(run) -> None:
+    async def test(bot) -> None:
+        with pytest.raises(RuntimeError):
+            async with bot.db.transaction() as session:
+                await bot.db.tickets.create_many([ticket(id, 7) for id in range(3)], session=session)
+                raise RuntimeError
+        assert bot.db.tickets.open_count(1) == 0
+
+    run(test)
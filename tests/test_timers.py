@@ -0,0 +1,67 @@
+import asyncio
+import datetime
+import random
+
+
+def test_due_timers_fire_in_expiry_order(run) -> None:
+    async def test(bot) -> None:
+        timers = bot.db.timers
+        # stopped while scheduling, a running dispatcher fires every overdue timer as soon as it is scheduled
+        await timers.teardown()
+        now = datetime.datetime.now()
+        offsets = list(range(-10, 0))
+        random.Random(4).shuffle(offsets)
+        for offset in offsets:
+            await timers.schedule(str(offset), now + datetime.timedelta(seconds=offset))
+        await timers.schedule("later", datetime.timedelta(seconds=0.2))
+        await timers.schedule("never", datetime.timedelta(hours=1))
+        timers._task = asyncio.create_task(timers._dispatcher())
+        await asyncio.sleep(0.5)
+        fired = [timer.event for event, (timer,) in bot.events if event == "timer_complete"]
+        assert fired == [str(offset) for offset in range(-10, 0)] + ["later"]
+        assert len(timers) == 1
+
+    run(test)
+
+
+def test_dispatch_waits_for_the_extensions(run) -> None:
+    async def test(bot) -> None:
+        await bot.db.timers.teardown()
+        bot.extensions_ready.clear()
+        bot.db.timers._task = asyncio.create_task(bot.db.timers._dispatcher())
+        await bot.db.timers.schedule("due", datetime.timedelta(seconds=-1))
+        await asyncio.sleep(0.1)
+        assert not bot.events
+        bot.extensions_ready.set()
+        await asyncio.sleep(0.1)
+        assert [event for event, _ in bot.events] == ["timer_complete"]
+
+    run(test)
+
+
+def test_cancel_in_a_rolled_back_transaction_keeps_the_timer(run) -> None:
+    async def test(bot) -> None:
+        timers = bot.db.timers
+        timer = await timers.schedule("kept", datetime.timedelta(seconds=0.2))
+        try:
+            async with bot.db.transaction() as session:
+                assert await timers.cancel(timer.id, session=session)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        await asyncio.sleep(0.4)
+        assert [timer.event for _, (timer,) in bot.events] == ["kept"]
+
+    run(test)
+
+
+def test_only_the_timers_of_the_own_shards_fire(run) -> None:
+    async def test(bot) -> None:
+        timers = bot.db.timers
+        for guild_id in (0, 1 << 22, 2 << 22, 3 << 22, None):
+            await timers.schedule(str(guild_id), datetime.timedelta(seconds=-1), guild_id=guild_id)
+        await asyncio.sleep(0.2)
+        assert sorted(timer.guild_id for _, (timer,) in bot.events) == [1 << 22, 3 << 22]
+        assert len(await timers.get_all()) == 3
+
+    run(test, shard_ids=[1], shard_count=2)